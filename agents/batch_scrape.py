@@ -0,0 +1,128 @@
+# agents/batch_scrape.py
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import StructuredTool
+
+logger = logging.getLogger("maharera.batch_scrape")
+
+# Projects scraped concurrently, and the most one tool call may request
+BATCH_CONCURRENCY = 4
+MAX_BATCH = 50
+
+_session = None
+_session_loop = None
+_lock = None
+_lock_loop = None
+
+
+def _session_lock() -> asyncio.Lock:
+    # asyncio.Lock belongs to one event loop, so keep one per loop like the session
+    global _lock, _lock_loop
+    loop = asyncio.get_running_loop()
+    if _lock is None or _lock_loop is not loop:
+        _lock, _lock_loop = asyncio.Lock(), loop
+    return _lock
+
+
+async def _shared_session():
+    """One warm ScraperSession (browser pool) per event loop, reused by every batch call."""
+    global _session, _session_loop
+    from main import ScraperSession
+
+    # Concurrent first calls would otherwise each start a browser pool and leak all but one
+    async with _session_lock():
+        loop = asyncio.get_running_loop()
+        if _session is None or _session_loop is not loop:
+            _session = await ScraperSession(pages=BATCH_CONCURRENCY).start()
+            _session_loop = loop
+        return _session
+
+
+async def close_batch_session():
+    """Close the shared browser pool; called from the supervisor's shutdown (SupervisorRouter.aclose)."""
+    global _session, _session_loop
+    async with _session_lock():
+        if _session is not None and _session_loop is asyncio.get_running_loop():
+            await _session.close()
+        _session = _session_loop = None
+
+
+async def _resolve(session, query: str) -> Optional[int]:
+    query = query.strip()
+    if query.isdigit():
+        return int(query)
+    return await session.resolve(query.upper())
+
+
+async def scrape_batch(projects: List[str], session=None) -> Dict[str, Any]:
+    """Scrape many projects concurrently and return one combined result, in request order."""
+    from main import scrape_many
+
+    requested = list(dict.fromkeys(str(p).strip() for p in projects if str(p).strip()))
+    skipped = requested[MAX_BATCH:]
+    requested = requested[:MAX_BATCH]
+    session = session or await _shared_session()
+
+    ids = await asyncio.gather(*(_resolve(session, q) for q in requested), return_exceptions=True)
+    results: Dict[str, Dict[str, Any]] = {}
+    to_scrape: Dict[int, List[str]] = {}
+    for query, project_id in zip(requested, ids):
+        if isinstance(project_id, int):
+            to_scrape.setdefault(project_id, []).append(query)
+        else:
+            error = f"{type(project_id).__name__}: {project_id}" if isinstance(project_id, Exception) \
+                else "registration number not found"
+            results[query] = {"query": query, "project_id": None, "record": None, "error": error}
+
+    async for result in scrape_many(list(to_scrape), concurrency=BATCH_CONCURRENCY, session=session):
+        record = result["record"]
+        for query in to_scrape[result["project_id"]]:
+            results[query] = {
+                "query": query,
+                "project_id": result["project_id"],
+                # "_" keys are structured child rows and scheduling details, as in the CSV output
+                "record": {k: v for k, v in record.items() if not k.startswith("_")} if record else None,
+                "error": result["error"],
+            }
+
+    ordered = [results[q] for q in requested]
+    return {
+        "source": "batch_scrape",
+        "requested": len(requested),
+        "succeeded": sum(1 for r in ordered if r["record"]),
+        "failed": sum(1 for r in ordered if not r["record"]),
+        "skipped": skipped,
+        "results": ordered,
+    }
+
+
+async def _abatch_scrape(projects: List[str]) -> str:
+    logger.info(f"Batch scraping {len(projects)} project(s)")
+    return json.dumps(await scrape_batch(projects), default=str)
+
+
+def _batch_scrape(projects: List[str]) -> str:
+    # Synchronous callers get a private browser pool for the duration of the call
+    from main import ScraperSession
+
+    async def run():
+        async with ScraperSession(pages=BATCH_CONCURRENCY) as session:
+            return await scrape_batch(projects, session=session)
+
+    return json.dumps(asyncio.run(run()), default=str)
+
+
+batch_scrape_tool = StructuredTool.from_function(
+    func=_batch_scrape,
+    coroutine=_abatch_scrape,
+    name="maharera_scrape_batch",
+    description=(
+        "Scrape several MahaRERA projects at once. `projects` is a list of registration "
+        f"numbers (P + 11 digits) or numeric project IDs, at most {MAX_BATCH}. They are "
+        "scraped concurrently and returned as one JSON object with a result per project. "
+        "Use this instead of repeated maharera_scrape calls when a question covers many projects."
+    ),
+)
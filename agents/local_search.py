@@ -0,0 +1,26 @@
+# agents/local_search.py
+import json
+import logging
+
+from langchain_core.tools import tool
+
+from agents.search_agent import search_tool
+from modules.search_index import get_search_index
+
+logger = logging.getLogger("maharera.local_search")
+
+
+@tool("maharera_search")
+def indexed_search_tool(query: str) -> str:
+    """
+    Find MahaRERA projects by building name, developer name or locality.
+    Answers from the local index of already-scraped projects (fuzzy and prefix
+    matching) and only searches the MahaRERA site when nothing matches locally.
+    """
+    hits = get_search_index().search(query, limit=10)
+    if hits:
+        logger.info(f"Local index answered '{query}' with {len(hits)} result(s)")
+        return json.dumps({"source": "local_index", "results": hits}, default=str)
+
+    logger.info(f"No local match for '{query}', falling back to site search")
+    return search_tool.invoke(query)
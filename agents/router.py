@@ -0,0 +1,146 @@
+# agents/router.py
+import re
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("maharera.router")
+
+# MahaRERA project registration numbers: P + 11 digits (e.g. P51800005350)
+REG_NO_PATTERN = re.compile(r"^p\d{11}$")
+
+# Words a plain "scrape this project" request may wrap around the identifiers.
+# Any other word means the query asks for more and goes to the LLM.
+FILLER_WORDS = frozenset({
+    "scrape", "fetch", "get", "show", "tell", "me", "about", "details", "detail", "info", "data",
+    "for", "of", "the", "and", "please", "project", "projects", "rera", "maharera",
+    "registration", "reg", "no", "number", "numbers",
+})
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Tools whose raw output is itself the answer (the ones fast_route dispatches
+# to). Only LLM decisions for these are cached: replaying any other tool would
+# return its raw output in place of the model's final answer.
+DIRECT_TOOLS = ("maharera_scrape", "maharera_scrape_batch")
+
+
+def normalise_query(query: str) -> str:
+    return " ".join(query.strip().lower().split())
+
+
+def fast_route(query: str) -> Optional[Tuple[str, Any]]:
+    """
+    Deterministic routing for inputs that need no LLM: queries made only of
+    registration numbers, or of one internal ID written as "id 1234", plus
+    FILLER_WORDS. A bare number is not taken as an ID, since it may as well be
+    a pincode or a year. Several registration numbers go to the batch scraper
+    in one call. Returns (tool_name, tool_input) or None.
+    """
+    tokens = _TOKEN.findall(normalise_query(query))
+    words = [t for t in tokens if t not in FILLER_WORDS]
+    if not words:
+        return None
+
+    if len(words) == 2 and words[0] == "id" and words[1].isdigit() and len(words[1]) <= 9:
+        return "maharera_scrape", words[1]
+
+    if all(REG_NO_PATTERN.match(w) for w in words):
+        reg_numbers = list(dict.fromkeys(w.upper() for w in words))
+        if len(reg_numbers) == 1:
+            return "maharera_scrape", reg_numbers[0]
+        return "maharera_scrape_batch", {"projects": reg_numbers}
+
+    return None
+
+
+class SupervisorRouter:
+    """
+    Pre-router in front of the AgentExecutor.
+
+    Trivial inputs are dispatched straight to the tool; everything else goes
+    through the LLM. When the LLM answers with a single call to one of
+    DIRECT_TOOLS, that routing decision is cached by normalised query so
+    repeats skip the model round-trip. `aclose()` (or `async with`) runs the
+    `on_close` hooks that release resources the tools hold.
+    """
+
+    def __init__(self, executor, tools, cache_size: int = 1024,
+                 on_close: Optional[List[Callable[[], Awaitable[Any]]]] = None):
+        self.executor = executor
+        self.tools = {t.name: t for t in tools}
+        self.on_close = list(on_close or [])
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self.stats = {"fast_path": 0, "cache_hit": 0, "llm": 0}
+
+    def route(self, query: str) -> Optional[Tuple[str, Any]]:
+        key = normalise_query(query)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["cache_hit"] += 1
+            return self._cache[key]
+
+        decision = fast_route(query)
+        if decision and decision[0] in self.tools:
+            self.stats["fast_path"] += 1
+            self._remember(key, decision)
+            return decision
+        return None
+
+    def _remember(self, key: str, decision: Tuple[str, Any]):
+        self._cache[key] = decision
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def aclose(self):
+        for hook in self.on_close:
+            try:
+                await hook()
+            except Exception as e:
+                logger.warning(f"Supervisor shutdown hook failed: {type(e).__name__}: {e}")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+        return False
+
+    def _remember_llm_route(self, query: str, result: Dict[str, Any]):
+        steps = result.get("intermediate_steps") or []
+        if len(steps) == 1 and steps[0][0].tool in DIRECT_TOOLS:
+            action = steps[0][0]
+            self._remember(normalise_query(query), (action.tool, action.tool_input))
+
+    def invoke(self, inputs: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        query = inputs["input"]
+        decision = self.route(query)
+
+        if decision:
+            tool_name, tool_input = decision
+            logger.info(f"Routing '{query}' directly to {tool_name}")
+            output = self.tools[tool_name].invoke(tool_input)
+            return {"input": query, "output": output, "route": tool_name}
+
+        self.stats["llm"] += 1
+        result = self.executor.invoke(inputs, **kwargs)
+
+        self._remember_llm_route(query, result)
+        return result
+
+    async def ainvoke(self, inputs: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        query = inputs["input"]
+        decision = self.route(query)
+
+        if decision:
+            tool_name, tool_input = decision
+            logger.info(f"Routing '{query}' directly to {tool_name}")
+            output = await self.tools[tool_name].ainvoke(tool_input)
+            return {"input": query, "output": output, "route": tool_name}
+
+        self.stats["llm"] += 1
+        result = await self.executor.ainvoke(inputs, **kwargs)
+
+        self._remember_llm_route(query, result)
+        return result
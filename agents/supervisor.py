@@ -7,8 +7,10 @@ from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
-from agents.search_agent import search_tool
+from agents.local_search import indexed_search_tool
+from agents.batch_scrape import batch_scrape_tool, close_batch_session
 from agents.scraper_agent import scrape_project_tool
+from agents.router import SupervisorRouter
 
 # Load .env (so OPENAI_API_KEY is picked up)
 load_dotenv()
@@ -31,6 +33,8 @@ Your responsibilities:
 3. Route correctly:
    • Tool: maharera_search → when user does NOT give a registration number.
    • Tool: maharera_scrape → when user gives a valid registration number.
+   • Tool: maharera_scrape_batch → when several projects must be scraped (e.g. all projects
+     of a developer found via search): pass every registration number in ONE call.
 4. Output ONLY the final structured JSON.
 5. Do NOT hallucinate RERA numbers.
 6. If search returns NOT_FOUND → ask user for more details.
@@ -52,20 +56,27 @@ PROMPT = ChatPromptTemplate.from_messages(
 # -------------------------
 # CREATE SUPERVISOR
 # -------------------------
-def create_supervisor_agent():
+def create_supervisor_agent(llm=None):
     """
     Creates the main supervisor agent (controller agent).
     It uses OpenAI function-calling model to invoke search/scraper tools.
+    Registration numbers and numeric IDs are routed to the scraper by
+    SupervisorRouter without an LLM round-trip.
+    Pass `llm` to swap the model (e.g. a fake chat model in tests).
+    Close it with `await supervisor.aclose()` (or use `async with`) to shut
+    down the batch scraper's shared browser pool.
     """
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",   # perfect routing model
-        temperature=0,
-    )
+    if llm is None:
+        llm = ChatOpenAI(
+            model="gpt-4o-mini",   # perfect routing model
+            temperature=0,
+        )
 
     tools = [
-        search_tool,
-        scrape_project_tool
+        indexed_search_tool,
+        scrape_project_tool,
+        batch_scrape_tool,
     ]
 
     # Build OpenAI Tools Agent
@@ -80,6 +91,7 @@ def create_supervisor_agent():
         agent=agent,
         tools=tools,
         verbose=True,
+        return_intermediate_steps=True,
     )
 
-    return executor
+    return SupervisorRouter(executor, tools, on_close=[close_batch_session])
@@ -0,0 +1 @@
+# Lets tests import `agents` and `modules` from the repository root.
@@ -1,16 +1,40 @@
+from __future__ import annotations
+
 import argparse
 import asyncio
+import csv
+import json
 import logging
 import os
-import pandas as pd
-import requests
-from selectolax.parser import HTMLParser
-
-from playwright.async_api import async_playwright, Page
-from playwright_stealth import stealth
-
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+# Only light modules load at startup. pandas, requests/selectolax, Playwright,
+# httpx and the OCR stack (OpenCV, NumPy, PIL, pytesseract) are imported in
+# the code paths that use them; check with `python main.py --import-report`.
 from modules.captcha_solver import CaptchaSolver
-from modules.data_extractor import DataExtracter
+from modules.data_extractor import DataExtracter, EXTRACTION_BLOCKS, resolve_selection
+from modules.daemon import ScrapeDaemon
+from modules.id_discovery import IdBitmap, ProbesInconclusive, discover_ids, BITMAP_FILENAME
+from modules.search_index import compact_search_indexes, get_search_index
+from modules.refresh_scheduler import compact_refresh_schedulers, get_refresh_scheduler, REFRESH_STATE_FILENAME
+from modules.history_store import HistoryStore, HISTORY_FILENAME
+from modules.captcha_session import CaptchaSessionManager
+from modules.tracing import tracer
+from modules.outlier_profiler import OutlierProfiler
+from modules.retry import DeadLetterQueue, RetryPolicy, StageError, run_stage, DEAD_LETTER_DIR
+from modules.memory_watchdog import MemoryWatchdog
+from modules.readiness import wait_until_stable
+from modules.deadline import Deadline, DeadlineExceeded, budget, current_deadline, within_deadline
+
+if TYPE_CHECKING:
+    import requests
+    from playwright.async_api import Page
+    from modules.document_store import DocumentDownloader
+    from modules.sql_sink import SqlSink
 
 
 # ---------------------------
@@ -29,6 +53,8 @@ logger = logging.getLogger("MahaReraScraper")
 BASE_URL = "https://maharerait.maharashtra.gov.in/public/project/view/"
 SEARCH_POST_URL = "https://maharerait.maharashtra.gov.in/SearchList/Search"
 OUTPUT_FILENAME = "single_project_output.csv"
+CAPTCHA_SELECTOR = "canvas#captcahCanvas"
+READY_SELECTOR = "div.form-card"
 
 DESIRED_ORDER = [
     "project_id", "registration_number", "date_of_registration", "project_name",
@@ -70,12 +96,19 @@ DESIRED_ORDER = [
     "maharera_certificate_nos"
 ]
 
-def get_project_id_from_registration(reg_no: str) -> int | None:
+def get_project_id_from_registration(reg_no: str, session: requests.Session | None = None) -> int | None:
     """
     Uses the REAL MahaRERA public search endpoint.
     Mimics the browser POST request.
     Extracts internal project_id cleanly.
     """
+    with tracer.span("resolve", reg_no=reg_no):
+        return _search_registration(reg_no, session)
+
+def _search_registration(reg_no: str, session: requests.Session | None) -> int | None:
+    import requests
+    from selectolax.parser import HTMLParser
+
     try:
         logger.info(f"Searching registration number: {reg_no}")
 
@@ -89,7 +122,7 @@ def get_project_id_from_registration(reg_no: str) -> int | None:
             "Content-Type": "application/x-www-form-urlencoded"
         }
 
-        resp = requests.post(SEARCH_POST_URL, data=payload, headers=headers, timeout=10)
+        resp = (session or requests).post(SEARCH_POST_URL, data=payload, headers=headers, timeout=10)
 
         if resp.status_code != 200:
             logger.error("POST search request failed.")
@@ -115,39 +148,279 @@ def get_project_id_from_registration(reg_no: str) -> int | None:
         logger.error(f"FAST SEARCH failed: {e}")
         return None
 
-async def save_record(data: dict):
-    df = pd.json_normalize([data])
+# Optional relational sink, opened by --sqlite
+_sql_sink: SqlSink | None = None
+
+# Delta-encoded per-project time series, opened by --history
+_history: HistoryStore | None = None
+
+# Projects that exhausted their per-stage retries
+dead_letters = DeadLetterQueue()
+
+# Solved-captcha session shared by every page and context of this process
+captcha_sessions = CaptchaSessionManager()
+
+# Deep capture of slow outliers, enabled by --profile-outliers
+outlier_profiler = OutlierProfiler()
+
+# Background Form 1/2/5 PDF downloads, enabled by --documents
+documents: DocumentDownloader | None = None
+
+# RSS watchdog that triggers context/browser recycling, enabled by --memory-limit
+watchdog = MemoryWatchdog()
+
+# Per-project scrape history that drives --refresh
+refresh_state_path = REFRESH_STATE_FILENAME
+
+# Wall-clock budget per project shared by every wait and retry; set by --deadline (0 = none)
+DEFAULT_PROJECT_DEADLINE_S = 180.0
+project_deadline_s: float = DEFAULT_PROJECT_DEADLINE_S
+
+def project_deadline():
+    """The deadline already active in this context, else a fresh one for a new project."""
+    active = current_deadline()
+    if active is not None:
+        return active
+    return Deadline(project_deadline_s) if project_deadline_s else nullcontext()
+
+def _csv_columns(df) -> list:
+    """The output CSV's header, or DESIRED_ORDER (plus any extra columns) for a new file."""
+    if os.path.exists(OUTPUT_FILENAME):
+        with open(OUTPUT_FILENAME, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), None)
+        if header:
+            return header
+    return DESIRED_ORDER + [c for c in df.columns if c not in DESIRED_ORDER]
+
+def _write_csv(data: dict):
+    import pandas as pd
+
+    # Keys starting with "_" hold structured child rows for the SQL sink, not CSV columns
+    df = pd.json_normalize([{k: v for k, v in data.items() if not k.startswith("_")}])
     file_exists = os.path.exists(OUTPUT_FILENAME)
+    # Partial (--fields/--sections) records leave the columns they skipped empty
+    df = df.reindex(columns=_csv_columns(df))
     df.to_csv(OUTPUT_FILENAME, mode='a', index=False, header=not file_exists)
 
-async def process_single_project(page: Page, captcha_solver: CaptchaSolver,
-                                 data_extractor: DataExtracter, project_id: int, url: str) -> bool:
+def _save_sinks() -> dict:
+    """Output sink name -> writer, in the order records are saved."""
+    sinks = {
+        "csv": _write_csv,
+        "search_index": lambda data: get_search_index().add(data),
+        "refresh": lambda data: get_refresh_scheduler(refresh_state_path).observe(data),
+    }
+    if _history:
+        sinks["history"] = _history.add
+    if _sql_sink:
+        sinks["sql"] = _sql_sink.add
+    return sinks
+
+async def save_record(data: dict, sinks: list[str] | None = None):
+    """Write `data` to every output sink, or only the named ones."""
+    with tracer.span("save", project=data.get("project_id")):
+        for name, write in _save_sinks().items():
+            if sinks is None or name in sinks:
+                write(data)
+
+async def _timed_stage(stage: str, fn, timings: dict, policies, label: str):
+    started = time.perf_counter()
     try:
-        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-
+        with tracer.span(stage, project=label):
+            return await within_deadline(run_stage(stage, fn, policies, label))
+    except DeadlineExceeded as e:
+        raise StageError(stage, f"project deadline exceeded: {e}", cause=e) from e
+    finally:
+        timings[stage] = round(time.perf_counter() - started, 3)
+
+async def prepare_project(page: Page, captcha_solver: CaptchaSolver, project_id: int, url: str,
+                          timings: dict | None = None,
+                          policies: dict[str, RetryPolicy] | None = None):
+    """
+    Navigation, captcha and readiness stages: leaves `page` showing the project, ready to extract.
+    Each stage is retried on its own policy; when a stage runs out of retries the
+    project is dead-lettered with a page snapshot and the StageError is raised.
+    """
+    timings = {} if timings is None else timings
+    label = str(project_id)
+
+    async def navigate():
+        await page.goto(url, wait_until='domcontentloaded', timeout=budget(60000))
+
+    async def solve_captcha():
+        # Neither captcha nor content on the page (e.g. it errored out after a
+        # rejected answer): navigate again before deciding.
+        required = await captcha_sessions.captcha_required(page, CAPTCHA_SELECTOR, READY_SELECTOR)
+        if required is None:
+            await navigate()
+            required = await captcha_sessions.captcha_required(page, CAPTCHA_SELECTOR, READY_SELECTOR)
+        if required is False:
+            return
         solved = await captcha_solver.solve_and_fill(
             page=page,
-            captcha_selector="canvas#captcahCanvas",
+            captcha_selector=CAPTCHA_SELECTOR,
             input_selector="input[name='captcha']",
             submit_selector="button.btn.btn-primary.next",
-            reg_no=str(project_id)
+            reg_no=label
         )
-
         if not solved:
-            logger.error("CAPTCHA solve failed.")
-            return False
+            raise StageError("captcha", "captcha unreadable or rejected")
+        await captcha_sessions.remember(page.context)
 
-        await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+    async def wait_ready():
+        # Event-driven: done as soon as the sections render and the DOM goes quiet
+        ready = await wait_until_stable(page, READY_SELECTOR)
+        timings["readiness_dom"] = round(ready["elapsed_ms"] / 1000, 3)
 
-        data = await data_extractor.extract_project_details(page, str(project_id))
+    try:
+        await _timed_stage("navigation", navigate, timings, policies, label)
+        await _timed_stage("captcha", solve_captcha, timings, policies, label)
+        await _timed_stage("readiness", wait_ready, timings, policies, label)
+    except StageError as e:
+        await dead_letters.add(project_id, e, page=page)
+        raise
+
+async def extract_prepared(page: Page, data_extractor: DataExtracter, project_id: int,
+                           timings: dict | None = None,
+                           policies: dict[str, RetryPolicy] | None = None) -> dict:
+    """Extraction stage on a page already prepared by prepare_project()."""
+    timings = {} if timings is None else timings
+    label = str(project_id)
+
+    async def extract():
+        data = await data_extractor.extract_project_details(page, label)
+        if not data:
+            raise StageError("extraction", "extractor returned no data")
+        return data
 
-        if data:
-            data["project_id"] = project_id
-            await save_record(data)
-            return True
+    try:
+        data = await _timed_stage("extraction", extract, timings, policies, label)
+    except StageError as e:
+        await dead_letters.add(project_id, e, page=page)
+        raise
+
+    data["project_id"] = project_id
+    if documents is not None and data.get("_documents"):
+        # Downloads continue in the background; the record is returned right away
+        try:
+            cookies = {c["name"]: c["value"] for c in await page.context.cookies()}
+            documents.schedule(project_id, data["_documents"], cookies)
+        except Exception as e:
+            logger.warning(f"Could not schedule document downloads for {project_id}: {e}")
+    return data
+
+async def scrape_project(page: Page, captcha_solver: CaptchaSolver,
+                         data_extractor: DataExtracter, project_id: int, url: str,
+                         timings: dict | None = None,
+                         policies: dict[str, RetryPolicy] | None = None) -> dict:
+    """
+    Navigate, solve the captcha and extract one project, returning the record.
+    Raises StageError (after dead-lettering) when a stage runs out of retries.
+    If `timings` is given, per-stage durations in seconds are recorded into it.
+    All stages share one project deadline (see project_deadline()).
+    """
+    timings = {} if timings is None else timings
+    watch = outlier_profiler.start(project_id, page)
+    failed = True
+    try:
+        with project_deadline(), tracer.span("project", project=project_id):
+            await prepare_project(page, captcha_solver, project_id, url, timings, policies)
+            data = await extract_prepared(page, data_extractor, project_id, timings, policies)
+        failed = False
+        return data
+    finally:
+        await watch.finish(failed)
+
+async def scrape_pipelined(context, captcha_solver: CaptchaSolver, data_extractor: DataExtracter,
+                           project_ids, depth: int = 1, stop=None, throttle=None):
+    """
+    Two-stage pipelined worker over one browser context.
+
+    While project N is being extracted, up to `depth` further projects are
+    navigated, captcha-solved and settled on their own pages, so network waits
+    and OCR overlap with extraction. Yields results in input order, shaped like
+    scrape_many(): {"project_id", "record", "timings", "error"}.
+    Once `stop()` returns true no new projects are started; the generator
+    finishes the ones in flight and returns, leaving the rest in `project_ids`
+    when that is an iterator. `throttle`, if given, is awaited before each
+    project starts, so rate limiting never eats into a project's deadline.
+    """
+    ids = iter(project_ids)
+    free_pages = deque([await prepare_page(context) for _ in range(depth + 1)])
+    in_flight: deque = deque()
+
+    async def fill():
+        while free_pages:
+            if stop is not None and stop():
+                return
+            project_id = next(ids, None)
+            if project_id is None:
+                return
+            project_id = int(project_id)
+            if throttle is not None:
+                await throttle()
+            page = free_pages.popleft()
+            timings: dict = {}
+            watch = outlier_profiler.start(project_id, page)
+            deadline = project_deadline()
+            # The task copies the context here, so preparation runs under the project's deadline
+            with deadline:
+                task = asyncio.create_task(
+                    prepare_project(page, captcha_solver, project_id, f"{BASE_URL}{project_id}", timings))
+            if isinstance(deadline, Deadline):
+                # Waiting behind earlier extractions doesn't count against this project
+                task.add_done_callback(lambda _, d=deadline: d.pause())
+            in_flight.append((project_id, page, task, timings, watch, deadline, time.perf_counter()))
+
+    await fill()
+    try:
+        while in_flight:
+            project_id, page, task, timings, watch, deadline, started = in_flight.popleft()
+            result = {"project_id": project_id, "record": None, "timings": timings, "error": None}
+            try:
+                await task
+                if isinstance(deadline, Deadline):
+                    deadline.resume()
+                with deadline:
+                    result["record"] = await extract_prepared(page, data_extractor, project_id, timings)
+            except StageError as e:
+                result["error"] = str(e)
+                result["failed_stage"] = e.stage
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            timings["total"] = round(time.perf_counter() - started, 3)
+            await watch.finish(failed=result["record"] is None)
+
+            free_pages.append(page)
+            await fill()
+            yield result
+    finally:
+        for _, _, task, _, watch, _, _ in in_flight:
+            task.cancel()
+            await watch.finish(failed=True)
+        await asyncio.gather(*(entry[2] for entry in in_flight), return_exceptions=True)
+        for page in free_pages:
+            await page.close()
+
+async def save_record_with_retry(data: dict, policies: dict[str, RetryPolicy] | None = None):
+    # Each sink is retried on its own, so a retry never repeats a write that
+    # already succeeded (a second CSV row, a double-counted refresh observation)
+    try:
+        for name in _save_sinks():
+            await run_stage("save", lambda name=name: save_record(data, [name]), policies,
+                            f"{data.get('project_id')} ({name})")
+    except StageError as e:
+        await dead_letters.add(data.get("project_id"), e, record=data)
+        raise
+
+async def process_single_project(page: Page, captcha_solver: CaptchaSolver,
+                                 data_extractor: DataExtracter, project_id: int, url: str) -> bool:
+    try:
+        data = await scrape_project(page, captcha_solver, data_extractor, project_id, url)
+        await save_record_with_retry(data)
+        return True
 
-        logger.error("Extractor returned no data.")
+    except StageError as e:
+        logger.error(f"Project {project_id} failed at stage '{e.stage}' after {e.attempts} attempt(s).")
         return False
 
     except Exception as e:
@@ -166,7 +439,15 @@ async def create_chromium_context(playwright):
         ]
     )
 
-    context = await browser.new_context(
+    context = await new_scrape_context(browser)
+    page = await prepare_page(context)
+
+    return browser, context, page
+
+
+async def new_scrape_context(browser):
+    return await browser.new_context(
+        storage_state=captcha_sessions.storage_state,
         user_agent=(
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -174,6 +455,10 @@ async def create_chromium_context(playwright):
         )
     )
 
+
+async def prepare_page(context):
+    from playwright_stealth import stealth
+
     page = await context.new_page()
     await stealth(page)
 
@@ -184,15 +469,467 @@ async def create_chromium_context(playwright):
         else route.continue_()
     )
 
-    return browser, context, page
+    return page
+
+
+def http_columns(fields: list[str] | None = None, sections: list[str] | None = None) -> list[str]:
+    """
+    The columns HTTP mode must produce to match the browser path for this
+    selection. Raises ValueError if any has no API mapping, since HTTP mode
+    would then fall back to the browser for every project.
+    """
+    from modules.http_client import uncovered_columns
+
+    wanted = resolve_selection(fields, sections)[1]
+    columns = list(DESIRED_ORDER) if wanted is None else sorted(wanted)
+    missing = uncovered_columns(columns)
+    if missing:
+        raise ValueError(f"HTTP mode cannot produce {len(missing)} of the selected columns "
+                         f"(e.g. {', '.join(missing[:5])}); pass --fields with columns from "
+                         f"COLUMN_PATHS in modules/http_client.py, or drop --http")
+    return columns
+
+class ScraperSession:
+    """
+    Keeps Playwright, Chromium, the OCR engine and the extractor warm so that
+    repeated scrapes only pay for the scrape itself.
+    Pages are handed out from a pool, one job per page at a time.
+
+    With http=True each project is first tried over plain HTTP
+    (HttpProjectClient); Chromium is only launched the first time a project
+    has to fall back to the browser path.
+    """
+
+    def __init__(self, pages: int = 1, save: bool = True, data_extractor: DataExtracter | None = None,
+                 http: bool = False):
+        self.num_pages = pages
+        self.save = save
+        self.captcha_solver = CaptchaSolver()
+        self.data_extractor = data_extractor or DataExtracter()
+        import requests
+
+        self.http = requests.Session()
+        self.http_client = None
+        if http:
+            from modules.http_client import HttpProjectClient
+            columns = http_columns(self.data_extractor.fields, self.data_extractor.sections)
+            self.http_client = HttpProjectClient(self.captcha_solver, columns)
+        self.http_stats = {"http_ok": 0, "browser_fallbacks": 0}
+        self._playwright = None
+        self.browser = None
+        self.context = None
+        self._pages: asyncio.Queue = asyncio.Queue()
+        self._browser_lock = asyncio.Lock()
+
+    async def start(self):
+        if self.http_client is None:
+            await self._ensure_browser()
+        return self
+
+    async def _ensure_browser(self):
+        async with self._browser_lock:
+            if self.browser is not None:
+                return
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            self.browser, self.context, page = await create_chromium_context(self._playwright)
+            await self._pages.put(page)
+            for _ in range(self.num_pages - 1):
+                await self._pages.put(await prepare_page(self.context))
+            logger.info(f"Scraper session ready with {self.num_pages} page(s).")
+
+    def stats(self) -> dict:
+        stats = captcha_sessions.stats()
+        if self.http_client:
+            stats.update(self.http_stats)
+        if watchdog.enabled:
+            stats.update(watchdog.stats())
+        return stats
+
+    async def close(self):
+        logger.info(f"Scraper session stats: {self.stats()}")
+        if self.http_client:
+            await self.http_client.close()
+        if self.browser:
+            await self.browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+        self.http.close()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def resolve(self, reg_no: str) -> int | None:
+        return await asyncio.to_thread(get_project_id_from_registration, reg_no, self.http)
+
+    async def scrape(self, project_id: int, timings: dict | None = None) -> dict:
+        """Scrape one project (HTTP first if enabled, else on a pooled page). Raises StageError on failure."""
+        # One deadline covers the HTTP attempt and the browser fallback; its clock
+        # is paused while the browser path waits for a pooled page
+        with project_deadline():
+            data = await self._scrape_http(project_id, timings) if self.http_client else None
+            if data is None:
+                data = await self._scrape_browser(project_id, timings)
+        if self.save:
+            await save_record_with_retry(data)
+        return data
+
+    async def _scrape_http(self, project_id: int, timings: dict | None) -> dict | None:
+        from modules.http_client import HttpModeUnavailable
+
+        started = time.perf_counter()
+        try:
+            with tracer.span("http_scrape", project=project_id):
+                data = await within_deadline(self.http_client.scrape(project_id))
+            self.http_stats["http_ok"] += 1
+            return data
+        except (HttpModeUnavailable, DeadlineExceeded) as e:
+            self.http_stats["browser_fallbacks"] += 1
+            logger.info(f"HTTP mode unavailable for {project_id} ({e}); falling back to browser.")
+            return None
+        finally:
+            if timings is not None:
+                timings["http"] = round(time.perf_counter() - started, 3)
+
+    async def _maybe_recycle(self):
+        """Swap in a fresh context (or browser) once every page is back, if the watchdog asks."""
+        if watchdog.recycle_action() is None:
+            return
+        async with self._browser_lock:
+            action = watchdog.recycle_action()
+            if action is None or self.browser is None:
+                return
+            # Taking every page back waits for in-flight scrapes to finish
+            for _ in range(self.num_pages):
+                await self._pages.get()
+            await self.context.close()
+            pages = []
+            if action == "browser":
+                await self.browser.close()
+                self.browser, self.context, page = await create_chromium_context(self._playwright)
+                pages.append(page)
+            else:
+                self.context = await new_scrape_context(self.browser)
+            while len(pages) < self.num_pages:
+                pages.append(await prepare_page(self.context))
+            for page in pages:
+                await self._pages.put(page)
+            await watchdog.recycled(action)
+
+    async def _scrape_browser(self, project_id: int, timings: dict | None) -> dict:
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.pause()
+        try:
+            await self._ensure_browser()
+            await self._maybe_recycle()
+            page = await self._pages.get()
+        finally:
+            if deadline is not None:
+                deadline.resume()
+        try:
+            return await scrape_project(page, self.captcha_solver, self.data_extractor,
+                                        project_id, f"{BASE_URL}{project_id}", timings)
+        finally:
+            await self._pages.put(page)
+
+
+async def scrape_many(project_ids, concurrency: int = 2, max_pending: int | None = None,
+                      session: ScraperSession | None = None, http: bool = False):
+    """
+    Library entry point: scrape many projects and yield each result as soon as it completes.
+
+        async for result in scrape_many(ids, concurrency=4):
+            store.write(result["record"])
+
+    Each result is {"project_id", "record", "timings", "error"} (plus "failed_stage"
+    when a stage exhausted its retries). At most `concurrency`
+    projects are in flight, and finished results wait in a queue of `max_pending`
+    (default: concurrency), so a slow consumer stalls the workers instead of
+    buffering results in memory. Records are not written to the CSV unless the
+    caller passes a session created with save=True. With http=True projects are
+    fetched browserless where possible, so concurrency can be much higher.
+    """
+    ids = iter(project_ids)
+    results: asyncio.Queue = asyncio.Queue(maxsize=max_pending or concurrency)
+    done = object()
+    owns_session = session is None
+    if owns_session:
+        session = await ScraperSession(pages=concurrency, save=False, http=http).start()
+
+    async def worker():
+        try:
+            for project_id in ids:
+                timings: dict = {}
+                started = time.perf_counter()
+                result = {"project_id": project_id, "record": None, "timings": timings, "error": None}
+                try:
+                    # A malformed ID becomes an error result rather than killing the worker
+                    project_id = result["project_id"] = int(project_id)
+                    result["record"] = await session.scrape(project_id, timings)
+                except StageError as e:
+                    result["error"] = str(e)
+                    result["failed_stage"] = e.stage
+                except Exception as e:
+                    result["error"] = f"{type(e).__name__}: {e}"
+                timings["total"] = round(time.perf_counter() - started, 3)
+                await results.put(result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"scrape_many worker stopped: {type(e).__name__}: {e}")
+        # Every worker that isn't cancelled signals done, or the consumer would wait forever
+        await results.put(done)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        remaining = len(workers)
+        while remaining:
+            item = await results.get()
+            if item is done:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if owns_session:
+            await session.close()
+
+
+async def crawl_discovered(bitmap: IdBitmap, pipeline_depth: int = 1,
+                           data_extractor: DataExtracter | None = None):
+    """Spend browser time only on IDs discovery has confirmed as real projects."""
+    project_ids = list(bitmap.iter_valid())
+    logger.info(f"Crawling {len(project_ids)} discovered project IDs (pipeline depth {pipeline_depth}).")
+    await crawl_projects(project_ids, pipeline_depth, data_extractor)
+
+
+async def refresh_due(bitmap: IdBitmap, per_hour: int, hours: float = 1.0, pipeline_depth: int = 1,
+                      data_extractor: DataExtracter | None = None):
+    """Re-scrape the most overdue known projects, paced to `per_hour`."""
+    scheduler = get_refresh_scheduler(refresh_state_path)
+    candidates = set(bitmap.iter_valid()) | {int(k) for k in scheduler.state}
+    project_ids = scheduler.next_batch(candidates, per_hour=per_hour, hours=hours)
+    if project_ids:
+        await crawl_projects(project_ids, pipeline_depth, data_extractor, max_per_hour=per_hour)
+
+
+async def crawl_projects(project_ids: list, pipeline_depth: int = 1,
+                         data_extractor: DataExtracter | None = None, max_per_hour: int | None = None):
+    """Batch runner: scrape and save `project_ids` on one pipelined browser context."""
+    from playwright.async_api import async_playwright
+
+    captcha_solver = CaptchaSolver()
+    data_extractor = data_extractor or DataExtracter()
+
+    async with async_playwright() as p:
+        browser, context, page = await create_chromium_context(p)
+        await page.close()
+        ok_count = launched = 0
+        started = time.perf_counter()
+        ids = iter(project_ids)
+
+        async def throttle():
+            # Stay within the hourly budget rather than bursting through it; this
+            # runs before a project starts, so the wait is outside its deadline
+            nonlocal launched
+            ahead = launched * 3600 / max_per_hour - (time.perf_counter() - started)
+            launched += 1
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+
+        while True:
+            async for result in scrape_pipelined(context, captcha_solver, data_extractor, ids,
+                                                 depth=pipeline_depth,
+                                                 stop=lambda: watchdog.recycle_action() is not None,
+                                                 throttle=throttle if max_per_hour else None):
+                if result["record"] is None:
+                    logger.error(f"FAILED: Project {result['project_id']}: {result['error']}")
+                    continue
+                try:
+                    await save_record_with_retry(result["record"])
+                    ok_count += 1
+                except StageError:
+                    pass
+
+            # The pipeline only returns early to let the watchdog recycle
+            action = watchdog.recycle_action()
+            if action is None:
+                break
+            await context.close()
+            if action == "browser":
+                await browser.close()
+                browser, context, page = await create_chromium_context(p)
+                await page.close()
+            else:
+                context = await new_scrape_context(browser)
+            await watchdog.recycled(action)
+        elapsed_min = (time.perf_counter() - started) / 60
+        logger.info(f"Crawl finished: {ok_count}/{len(project_ids)} projects scraped "
+                    f"({ok_count / elapsed_min if elapsed_min else 0:.1f} projects/min).")
+        logger.info(f"Captcha session stats: {captcha_sessions.stats()}")
+        if watchdog.enabled:
+            logger.info(f"Memory stats: {watchdog.stats()}")
+        await browser.close()
 
 
 async def main():
     parser = argparse.ArgumentParser(description="Scrape MahaRERA project details.")
     parser.add_argument("--id", type=str, help="Numeric MahaRERA project ID")
     parser.add_argument("--reg", type=str, help="Registration number (e.g., P51800005350)")
+    parser.add_argument("--discover", type=str, metavar="START-END",
+                        help="Probe an ID range without captchas and update the ID bitmap")
+    parser.add_argument("--crawl-discovered", action="store_true",
+                        help="Scrape every ID the bitmap marks as valid")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-scrape the most overdue known projects by status, age and change history")
+    parser.add_argument("--refresh-budget", type=int, default=200,
+                        help="Projects per hour --refresh may scrape")
+    parser.add_argument("--refresh-hours", type=float, default=1.0,
+                        help="Hours of budget one --refresh run schedules")
+    parser.add_argument("--refresh-state", type=str, default=REFRESH_STATE_FILENAME,
+                        help="Path of the per-project refresh history")
+    parser.add_argument("--bitmap", type=str, default=BITMAP_FILENAME, help="Path of the ID bitmap file")
+    parser.add_argument("--serve", action="store_true", help="Run as a daemon with a warm browser and a local job API")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Daemon bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Daemon TCP port")
+    parser.add_argument("--socket", type=str, help="Serve on this Unix socket instead of TCP")
+    parser.add_argument("--pages", type=int, default=2, help="Concurrent pages kept warm by the daemon")
+    parser.add_argument("--sqlite", type=str,
+                        help="Also write normalised tables to this SQLite (or .duckdb) file")
+    parser.add_argument("--history", type=str, nargs="?", const=HISTORY_FILENAME, metavar="PATH",
+                        help="Also record each scrape as field deltas in this SQLite history store")
+    parser.add_argument("--as-of", type=str, nargs=2, metavar=("PROJECT_ID", "DATE"),
+                        help="Print a project's fields as of DATE from the history store and exit")
+    parser.add_argument("--changes", type=str, metavar="FIELD",
+                        help="Print every recorded change of FIELD (optionally only for --id) and exit")
+    parser.add_argument("--pipeline-depth", type=int, default=1,
+                        help="Projects prepared ahead on extra pages while one is extracted (0 = serial)")
+    parser.add_argument("--fields", type=lambda v: [f.strip() for f in v.split(",") if f.strip()],
+                        help="Comma-separated output columns to extract (only the blocks producing them run)")
+    parser.add_argument("--sections", type=lambda v: [f.strip() for f in v.split(",") if f.strip()],
+                        help=f"Comma-separated sections to extract: {', '.join(EXTRACTION_BLOCKS)}")
+    parser.add_argument("--trace", type=str, metavar="PATH",
+                        help="Record spans and write a Chrome trace-event JSON file (chrome://tracing, Perfetto)")
+    parser.add_argument("--profile-outliers", action="store_true",
+                        help="Keep a Playwright trace, event-loop profile and snapshot of unusually slow projects")
+    parser.add_argument("--slow-threshold", type=float,
+                        help="Seconds after which a project counts as slow (default: rolling percentile)")
+    parser.add_argument("--slow-percentile", type=float, default=0.99,
+                        help="Rolling latency percentile used when no fixed threshold is given")
+    parser.add_argument("--http", action="store_true",
+                        help="Try the browserless HTTP client first and fall back to Chromium per project; "
+                             "needs a --fields selection HTTP mode can produce")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_PROJECT_DEADLINE_S,
+                        help="Seconds one project may take across all stages and retries (0 = no limit)")
+    parser.add_argument("--documents", type=str, metavar="DIR",
+                        help="Download Form 1/2/5 PDFs from each project's document library into DIR")
+    parser.add_argument("--document-concurrency", type=int, default=4,
+                        help="Parallel document downloads")
+    parser.add_argument("--memory-limit", type=float, metavar="MB",
+                        help="Recycle the browser context (then the browser) when Python plus Chromium RSS exceeds this")
+    parser.add_argument("--memory-interval", type=float, default=15.0,
+                        help="Seconds between memory samples")
+    parser.add_argument("--resolve-only", action="store_true",
+                        help="With --reg, print the internal project ID and exit without scraping")
+    parser.add_argument("--import-report", action="store_true",
+                        help="Summarise startup import time (python -X importtime) and fail if heavy packages load")
+    parser.add_argument("--import-budget-ms", type=float,
+                        help="Also fail the import report when startup imports take longer than this")
+    parser.add_argument("--dead-letter-dir", type=str, default=DEAD_LETTER_DIR,
+                        help="Where projects that exhaust their retries are recorded")
     args = parser.parse_args()
 
+    if args.import_report:
+        from modules.import_report import report
+        sys.exit(report("main", budget_ms=args.import_budget_ms, cwd=os.path.dirname(os.path.abspath(__file__))))
+
+    if args.http:
+        try:
+            http_columns(args.fields, args.sections)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.as_of or args.changes:
+        history = HistoryStore(args.history or HISTORY_FILENAME)
+        if args.as_of:
+            result = history.as_of(int(args.as_of[0]), args.as_of[1])
+        else:
+            result = history.changes(args.changes, project_id=args.id)
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        history.close()
+        return
+
+    global _history, _sql_sink, dead_letters, outlier_profiler, project_deadline_s, refresh_state_path, documents, watchdog
+    project_deadline_s = args.deadline
+    refresh_state_path = args.refresh_state
+    dead_letters = DeadLetterQueue(args.dead_letter_dir)
+    outlier_profiler = OutlierProfiler(enabled=args.profile_outliers, threshold_s=args.slow_threshold,
+                                       percentile=args.slow_percentile)
+    if args.history:
+        _history = HistoryStore(args.history)
+    if args.sqlite:
+        from modules.sql_sink import SqlSink
+        _sql_sink = SqlSink(args.sqlite, DESIRED_ORDER)
+    if args.trace:
+        tracer.enable()
+    if args.documents:
+        from modules.document_store import DocumentDownloader
+        documents = DocumentDownloader(args.documents, concurrency=args.document_concurrency)
+    watchdog = MemoryWatchdog(args.memory_limit, interval_s=args.memory_interval)
+    if _sql_sink:
+        # Don't hold a batch of records in memory while over the limit
+        watchdog.on_pressure(_sql_sink.flush)
+    watchdog.start()
+    try:
+        await run(args)
+    finally:
+        await watchdog.stop()
+        if documents:
+            await documents.close()
+        if _sql_sink:
+            _sql_sink.close()
+        if _history:
+            _history.close()
+        compact_search_indexes()
+        compact_refresh_schedulers()
+        if args.trace:
+            tracer.export(args.trace)
+
+
+async def run(args):
+    data_extractor = DataExtracter(fields=args.fields, sections=args.sections)
+
+    if args.serve:
+        async with ScraperSession(pages=args.pages, data_extractor=data_extractor, http=args.http) as session:
+            await ScrapeDaemon(session, host=args.host, port=args.port, socket_path=args.socket).serve_forever()
+        return
+
+    if args.discover:
+        start, end = (int(x) for x in args.discover.split("-"))
+        try:
+            await discover_ids(start, end, path=args.bitmap)
+        except ProbesInconclusive as e:
+            logger.error(f"Discovery aborted: {e}")
+        return
+
+    bitmap = IdBitmap.load(args.bitmap)
+
+    if args.crawl_discovered:
+        await crawl_discovered(bitmap, pipeline_depth=args.pipeline_depth, data_extractor=data_extractor)
+        return
+
+    if args.refresh:
+        await refresh_due(bitmap, args.refresh_budget, hours=args.refresh_hours,
+                          pipeline_depth=args.pipeline_depth, data_extractor=data_extractor)
+        return
+
     # Case 1: User provided project ID
     if args.id:
         project_id = args.id
@@ -203,6 +940,9 @@ async def main():
         if not project_id:
             logger.error("Could not resolve registration number.")
             return
+        if args.resolve_only:
+            print(project_id)
+            return
 
     # Case 3: Interactive mode
     else:
@@ -219,8 +959,23 @@ async def main():
     project_id = int(project_id)
     url = f"{BASE_URL}{project_id}"
 
+    if bitmap.status(project_id) is False:
+        logger.error(f"Project ID {project_id} is marked invalid in {args.bitmap}; skipping.")
+        return
+
+    if args.http:
+        logger.info(f"Scraping project ID: {project_id} (HTTP first, browser fallback)")
+        async with ScraperSession(pages=1, data_extractor=data_extractor, http=True) as session:
+            try:
+                await session.scrape(project_id)
+                logger.info(f"SUCCESS: Project {project_id} scraped.")
+            except StageError:
+                logger.error(f"FAILED: Project {project_id} could not be scraped.")
+        return
+
+    from playwright.async_api import async_playwright
+
     captcha_solver = CaptchaSolver()
-    data_extractor = DataExtracter()
 
     async with async_playwright() as p:
         browser, context, page = await create_chromium_context(p)
@@ -0,0 +1,159 @@
+import io
+import json
+import os
+import threading
+import time
+import logging
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.jsonl"
+
+
+def dhash(image_bytes: bytes, size: int = 8) -> int:
+    """64-bit difference hash: robust to re-encoding and small noise, cheap to compare."""
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(image_bytes)).convert("L").resize((size + 1, size), Image.LANCZOS)
+    pixels = list(img.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+class CaptchaCorpus:
+    """
+    Labelled captcha images collected from live solves.
+
+    Each captcha is stored once per perceptual hash as
+    `<dir>/images/<hh>/<hash>.png`; `manifest.jsonl` holds one line per sample
+    (latest line per hash wins) with the OCR answer and whether the portal
+    accepted it, so accepted answers are ground-truth labels. A repeat of the
+    same hash is merged; a near-duplicate (Hamming distance <= `max_distance`)
+    only when its answer agrees, since similar-looking captchas can read
+    differently. A label is only ever stored with the image it was given for.
+    Past `max_items` the oldest unconfirmed samples are evicted first.
+    """
+
+    def __init__(self, directory: str, max_items: int = 20000, max_distance: int = 2):
+        self.directory = directory
+        self.max_items = max_items
+        self.max_distance = max_distance
+        self.manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        self.samples: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "images"), exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    if entry.get("deleted"):
+                        self.samples.pop(entry["hash"], None)
+                    else:
+                        self.samples[entry["hash"]] = entry
+        logger.info(f"Loaded captcha corpus with {len(self.samples)} samples from {self.directory}")
+
+    def _duplicate_of(self, phash: int, answer: Optional[str]) -> Optional[str]:
+        key = f"{phash:016x}"
+        if key in self.samples:
+            return key
+        if self.max_distance <= 0 or not answer:
+            return None
+        for other, sample in self.samples.items():
+            if sample.get("answer") == answer and (int(other, 16) ^ phash).bit_count() <= self.max_distance:
+                return other
+        return None
+
+    def _write_image(self, key: str, image_bytes: bytes) -> str:
+        rel_path = os.path.join("images", key[:2], f"{key}.png")
+        os.makedirs(os.path.join(self.directory, "images", key[:2]), exist_ok=True)
+        with open(os.path.join(self.directory, rel_path), "wb") as f:
+            f.write(image_bytes)
+        return rel_path
+
+    def add(self, image_bytes: bytes, answer: Optional[str], accepted: Optional[bool],
+            source: str = "browser") -> Optional[str]:
+        """Store one solve attempt; returns the sample's hash, or None if it was a duplicate."""
+        phash = dhash(image_bytes)
+        with self._lock:
+            existing = self._duplicate_of(phash, answer)
+            if existing is not None:
+                sample = self.samples[existing]
+                sample["seen"] = sample.get("seen", 1) + 1
+                # A confirmed label beats an unconfirmed or rejected one
+                if accepted and not sample.get("accepted"):
+                    if sample.get("answer") != answer:
+                        # Same hash, different reading: keep the label with the image it was accepted for
+                        sample["file"] = self._write_image(existing, image_bytes)
+                    sample.update(answer=answer, accepted=True)
+                    self._append(sample)
+                return None
+
+            key = f"{phash:016x}"
+            rel_path = self._write_image(key, image_bytes)
+            sample = {"hash": key, "file": rel_path, "answer": answer, "accepted": accepted,
+                      "source": source, "seen": 1, "captured_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            self.samples[key] = sample
+            self._append(sample)
+            if len(self.samples) > self.max_items:
+                self._evict()
+            return key
+
+    def _append(self, entry: Dict[str, Any]):
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _evict(self):
+        """Drop to 90% of the cap, unconfirmed and oldest first, then compact the manifest."""
+        target = int(self.max_items * 0.9)
+        ranked = sorted(self.samples.values(), key=lambda s: (bool(s.get("accepted")), s["captured_at"]))
+        for sample in ranked[:len(self.samples) - target]:
+            self.samples.pop(sample["hash"], None)
+            try:
+                os.remove(os.path.join(self.directory, sample["file"]))
+            except OSError:
+                pass
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for sample in self.samples.values():
+                f.write(json.dumps(sample) + "\n")
+        os.replace(tmp, self.manifest_path)
+        logger.info(f"Captcha corpus trimmed to {len(self.samples)} samples.")
+
+    def labelled(self, accepted_only: bool = True) -> Iterator[Tuple[str, str]]:
+        """(image path, answer) pairs for training or evaluating a solver."""
+        for sample in list(self.samples.values()):
+            if sample.get("answer") and (sample.get("accepted") or not accepted_only):
+                yield os.path.join(self.directory, sample["file"]), sample["answer"]
+
+    def stats(self) -> Dict[str, Any]:
+        accepted = sum(1 for s in self.samples.values() if s.get("accepted"))
+        return {"samples": len(self.samples), "accepted_labels": accepted}
+
+
+_corpora: Dict[str, CaptchaCorpus] = {}
+_corpora_lock = threading.Lock()
+
+
+def get_captcha_corpus(directory: str, max_items: int = 20000) -> CaptchaCorpus:
+    """
+    Process-wide corpus per directory, loaded on first use. Separate instances
+    over one directory would each evict from, and rewrite the manifest with,
+    only their own view of the samples.
+    """
+    key = os.path.abspath(directory)
+    with _corpora_lock:
+        if key not in _corpora:
+            _corpora[key] = CaptchaCorpus(directory, max_items=max_items)
+        return _corpora[key]
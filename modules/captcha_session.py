@@ -0,0 +1,65 @@
+import os
+import logging
+from typing import Any, Dict, Optional
+
+from modules.deadline import budget
+
+logger = logging.getLogger(__name__)
+
+SESSION_STATE_FILENAME = "captcha_session.json"
+
+
+class CaptchaSessionManager:
+    """
+    Reuses a solved-captcha session across project pages.
+
+    After a successful solve the context's storage state (cookies + local
+    storage) is saved; on the next navigation we first check whether the
+    portal still shows the captcha and skip solve_and_fill when it does not.
+    New browser contexts are seeded from the saved state.
+    """
+
+    def __init__(self, state_path: str = SESSION_STATE_FILENAME, probe_timeout: int = 5000):
+        self.state_path = state_path
+        self.probe_timeout = probe_timeout
+        self.solved = 0
+        self.avoided = 0
+
+    @property
+    def storage_state(self) -> Optional[str]:
+        """Path to pass as `storage_state` when creating a context, if a session was saved."""
+        return self.state_path if os.path.exists(self.state_path) else None
+
+    async def captcha_required(self, page, captcha_selector: str, ready_selector: str) -> Optional[bool]:
+        """
+        True if the captcha is shown, False if project content rendered without it,
+        None if neither appeared within the probe timeout.
+        """
+        try:
+            await page.wait_for_selector(f"{captcha_selector}, {ready_selector}", timeout=budget(self.probe_timeout))
+        except Exception:
+            return None
+        if await page.locator(captcha_selector).count():
+            return True
+        self.avoided += 1
+        logger.info(f"Captcha not required, session reused (avoided rate {self.avoided_rate:.0%}).")
+        return False
+
+    async def remember(self, context):
+        self.solved += 1
+        try:
+            await context.storage_state(path=self.state_path)
+        except Exception as e:
+            logger.warning(f"Could not save captcha session state: {e}")
+
+    @property
+    def avoided_rate(self) -> float:
+        total = self.solved + self.avoided
+        return self.avoided / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "captchas_solved": self.solved,
+            "captchas_avoided": self.avoided,
+            "captcha_avoided_rate": round(self.avoided_rate, 3),
+        }
@@ -1,21 +1,39 @@
+import asyncio
 import os
 import time
-from PIL import Image
 import io
-import pytesseract
-import numpy as np
-import cv2
 import logging
 
+from modules.captcha_corpus import get_captcha_corpus
+from modules.deadline import budget
+from modules.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
 class CaptchaSolver:
-    def __init__(self, captcha_dir="./captchas"):
+    def __init__(self, captcha_dir="./captchas", collect=True, max_corpus=20000):
         self.captcha_dir = captcha_dir
         os.makedirs(self.captcha_dir, exist_ok=True)
+        # Every live attempt is kept with its answer and outcome as training data;
+        # all solvers over one directory share a corpus
+        self.corpus = get_captcha_corpus(captcha_dir, max_items=max_corpus) if collect else None
+
+    async def record(self, image_bytes, answer, accepted, source="browser"):
+        """Add one attempt to the captcha corpus; never fails the solve."""
+        if self.corpus is None:
+            return
+        try:
+            await asyncio.to_thread(self.corpus.add, image_bytes, answer, accepted, source)
+        except Exception as e:
+            logger.warning(f"Could not record captcha sample: {e}")
 
     async def preprocess_image(self, image_bytes):
         """Convert captcha image to binary thresholded form for OCR."""
+        # The OCR stack is heavy; load it on the first captcha, not at startup
+        import cv2
+        import numpy as np
+        from PIL import Image
+
         img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
         img_np = np.array(img)
         gray = cv2.cvtColor(img_np, cv2.COLOR_RGB2GRAY)
@@ -27,7 +45,13 @@ class CaptchaSolver:
     async def extract_text(self, image_bytes):
         """Run OCR on captcha image with multiple configs."""
         processed_img = await self.preprocess_image(image_bytes)
-        
+        # Tesseract is CPU-bound; keep it off the event loop so other pages keep loading
+        return await asyncio.to_thread(self._ocr, image_bytes, processed_img)
+
+    def _ocr(self, image_bytes, processed_img):
+        import pytesseract
+        from PIL import Image
+
         configs = [
             '--psm 8 --oem 3 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz',
             '--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
@@ -55,27 +79,36 @@ class CaptchaSolver:
         logger.info(f"Attempting to solve captcha for {reg_no} (1 attempt only).")
         try:
             # Wait for captcha element and take screenshot
-            captcha_el = await page.wait_for_selector(captcha_selector, timeout=10000)
-            captcha_bytes = await captcha_el.screenshot(type="png", scale="device")
+            with tracer.span("captcha.capture", project=reg_no):
+                captcha_el = await page.wait_for_selector(captcha_selector, timeout=budget(10000))
+                captcha_bytes = await captcha_el.screenshot(type="png", scale="device")
 
             # Extract OCR text
-            captcha_text = await self.extract_text(captcha_bytes)
+            with tracer.span("captcha.ocr", project=reg_no):
+                captcha_text = await self.extract_text(captcha_bytes)
             logger.info(f"[DEBUG] OCR extracted: {captcha_text}")
 
             if captcha_text:
-                # Fill input and submit
-                await page.fill(input_selector, captcha_text)
-                await page.click(submit_selector)
+                with tracer.span("captcha.submit", project=reg_no):
+                    # Fill input and submit
+                    await page.fill(input_selector, captcha_text)
+                    await page.click(submit_selector)
+
+                    # Success check: Wait for captcha to disappear
+                    try:
+                        await page.wait_for_selector(captcha_selector, state="detached", timeout=budget(5000))
+                        accepted = True
+                    except Exception:
+                        accepted = False
 
-                # Success check: Wait for captcha to disappear
-                try:
-                    await page.wait_for_selector(captcha_selector, state="detached", timeout=5000)
+                await self.record(captcha_bytes, captcha_text, accepted)
+                if accepted:
                     logger.info(f"✅ Captcha solved successfully for {reg_no}")
                     return True # Success
-                except Exception:
-                    logger.warning(f"Captcha incorrect for {reg_no}. Marking as failed.")
-                    return False # Failure (incorrect captcha)
+                logger.warning(f"Captcha incorrect for {reg_no}. Marking as failed.")
+                return False # Failure (incorrect captcha)
             else:
+                await self.record(captcha_bytes, None, None)
                 logger.warning(f"OCR failed to read text for {reg_no}. Marking as failed.")
                 return False # Failure (OCR couldn't read)
 
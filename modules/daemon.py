@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class ScrapeDaemon:
+    """
+    Minimal local job API on top of a warm scraper session.
+
+    Endpoints (HTTP/1.1 over TCP or a Unix socket):
+      GET  /health          -> session stats
+      POST /scrape          {"id": 123} or {"reg": "P5180..."} -> one JSON result
+      POST /scrape/stream   {"ids": [...], "regs": [...]}      -> NDJSON, one line per finished job
+
+    `session` must provide `resolve(reg_no)` and `scrape(project_id)` coroutines.
+    """
+
+    def __init__(self, session, host: str = "127.0.0.1", port: int = 8765, socket_path: Optional[str] = None):
+        self.session = session
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.started_at = time.time()
+        self.jobs_done = 0
+        self.jobs_failed = 0
+
+    async def serve_forever(self):
+        if self.socket_path:
+            server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+            logger.info(f"Daemon listening on unix:{self.socket_path}")
+        else:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+            logger.info(f"Daemon listening on http://{self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+    async def run_job(self, project_id: Optional[int] = None, reg_no: Optional[str] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"project_id": project_id, "reg_no": reg_no, "ok": False,
+                                  "record": None, "error": None}
+        try:
+            if project_id is None:
+                project_id = await self.session.resolve(reg_no)
+                result["project_id"] = project_id
+                if project_id is None:
+                    result["error"] = "registration number could not be resolved"
+                    return result
+            record = await self.session.scrape(int(project_id))
+            result["ok"] = record is not None
+            result["record"] = record
+            if record is None:
+                result["error"] = "scrape failed"
+        except Exception as e:
+            logger.error(f"Daemon job failed for {project_id or reg_no}: {e}")
+            result["error"] = str(e)
+            result["failed_stage"] = getattr(e, "stage", None)
+        finally:
+            result["elapsed_s"] = round(time.perf_counter() - started, 3)
+            if result["ok"]:
+                self.jobs_done += 1
+            else:
+                self.jobs_failed += 1
+        return result
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        method, path, _ = request_line.split(" ", 2)
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path, body
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Any):
+        body = json.dumps(payload, default=str).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def _stream(self, writer: asyncio.StreamWriter, jobs):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        for next_done in asyncio.as_completed([self.run_job(**job) for job in jobs]):
+            line = (json.dumps(await next_done, default=str) + "\n").encode()
+            writer.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                payload = json.loads(body) if body else {}
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                await self._respond(writer, 400, {"error": f"malformed request: {e}"})
+                return
+
+            if path == "/health":
+                await self._respond(writer, 200, {
+                    "uptime_s": round(time.time() - self.started_at, 1),
+                    "jobs_done": self.jobs_done,
+                    "jobs_failed": self.jobs_failed,
+                    **(self.session.stats() if hasattr(self.session, "stats") else {}),
+                })
+            elif path == "/scrape" and method == "POST":
+                if "id" not in payload and "reg" not in payload:
+                    await self._respond(writer, 400, {"error": "expected 'id' or 'reg'"})
+                    return
+                result = await self.run_job(payload.get("id"), payload.get("reg"))
+                await self._respond(writer, 200, result)
+            elif path == "/scrape/stream" and method == "POST":
+                jobs = [{"project_id": i} for i in payload.get("ids", [])]
+                jobs += [{"reg_no": r} for r in payload.get("regs", [])]
+                await self._stream(writer, jobs)
+            elif path in ("/scrape", "/scrape/stream"):
+                await self._respond(writer, 405, {"error": "use POST"})
+            else:
+                await self._respond(writer, 404, {"error": f"unknown path {path}"})
+        except Exception as e:
+            logger.error(f"Daemon request failed: {e}")
+            try:
+                await self._respond(writer, 500, {"error": str(e)})
+            except Exception:
+                pass
+        finally:
+            writer.close()
@@ -1,50 +1,200 @@
+from __future__ import annotations
+
 import asyncio
 import re
-from typing import Dict, List, Optional, Any
+import time
+from contextlib import AsyncExitStack
+from urllib.parse import urljoin
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Any, Tuple
 import logging
-from playwright.async_api import Page, expect
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+from modules.deadline import DeadlineExceeded, budget, remaining
+from modules.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+# Seconds before the project deadline at which unfinished blocks are abandoned
+DEADLINE_GRACE_S = 1.0
+
+class Block(NamedTuple):
+    """
+    One extraction block. `changes` names the UI regions it clicks or expands
+    (see UI_REGIONS); `reads` names regions it reads that other blocks change.
+    Blocks sharing a region run one at a time; all others run concurrently.
+    """
+    method: str
+    columns: List[str]
+    changes: Tuple[str, ...] = ()
+    reads: Tuple[str, ...] = ()
+
+    @property
+    def mutates(self) -> bool:
+        return bool(self.changes)
+
+
+# Page regions that blocks change by clicking
+UI_REGIONS = {
+    # The promoter tab strip: clicking a tab swaps the pane below it
+    "promoter_tabs": ".tabs and the tab pane after it",
+    # Document library, parking and agent panels are Bootstrap collapses that
+    # may share a parent, so expanding one can collapse another
+    "accordion": "#documentLibrary, #parkingDetails, the Registered Agent(s) panel",
+}
+
+
+# Section name -> block, in page order
+EXTRACTION_BLOCKS: Dict[str, Block] = {
+    "registration": Block("_extract_registration_block", ["registration_number", "date_of_registration"]),
+    "project_details": Block("_extract_project_details_block", [
+        "project_name", "project_type", "project_location", "proposed_completion_date",
+        "extension_date", "project_status"]),
+    "planning_authority": Block("_extract_planning_authority_block", [
+        "planning_authority", "full_name_of_planning_authority"]),
+    "planning_land": Block("_extract_planning_land_block", [
+        "final_plot_bearing", "total_land_area", "land_area_applied", "permissible_builtup",
+        "sanctioned_builtup", "aggregate_open_space"]),
+    "commencement_certificate": Block("_extract_commencement_certificate", [
+        "CC/NA Order Issued to", "CC/NA Order in the name of"]),
+    "project_address": Block("_extract_project_address", [
+        "project_address_state_ut", "project_address_district", "project_address_taluka",
+        "project_address_village", "project_address_pin_code"]),
+    "promoter_details": Block("_extract_promoter_details", ["promoter_details"]),
+    "promoter_address": Block("_extract_promoter_address", [
+        "promoter_official_communication_address_state_ut",
+        "promoter_official_communication_address_district",
+        "promoter_official_communication_address_taluka",
+        "promoter_official_communication_address_village",
+        "promoter_official_communication_address_pin_code"]),
+    "tabs": Block("_extract_all_tab_data", [
+        "partner_name", "partner_designation", "promoter_past_project_names",
+        "promoter_past_project_statuses", "promoter_past_litigation_statuses",
+        "authorised_signatory_names", "authorised_signatory_designations", "spa_name", "spa_designation",
+        "architect_names", "engineer_names", "chartered_accountant_names", "other_professional_names",
+        "sro_name", "sro_document_name"], changes=("promoter_tabs",)),
+    "form_dates": Block("_extract_latest_form_dates", [
+        "latest_form1_date", "latest_form2_date", "latest_form5_date", "has_occupancy_certificate"],
+        changes=("accordion",)),
+    "landowners": Block("extract_promoter_landowner_details", [
+        "promoter_is_landowner", "has_other_landowners", "landowner_names", "landowner_types",
+        "landowner_share_types"]),
+    "investors": Block("_extract_investor_flag", ["are_there_investors_other_than_promoter"]),
+    "litigation": Block("_extract_litigation_details", ["litigation_against_project_count"]),
+    "buildings": Block("_extract_building_details", [
+        "building_identification_plan", "wing_identification_plan", "sanctioned_floors",
+        "sanctioned_habitable_floors", "sanctioned_apartments", "cc_issued_floors", "view_document_available"]),
+    "unit_summary": Block("_extract_apartment_summary", [
+        "summary_identification_building_wing", "summary_identification_wing_plan", "summary_floor_type",
+        "summary_total_no_of_residential_apartments", "summary_total_no_of_non_residential_apartments",
+        "summary_total_no_of_apartments_nr_r", "summary_total_no_of_sold_units",
+        "summary_total_no_of_unsold_units", "summary_total_no_of_booked", "summary_total_no_of_rehab_units",
+        "summary_total_no_of_mortgage", "summary_total_no_of_reservation",
+        "summary_total_no_of_land_owner_investor_share_sale",
+        "summary_total_no_of_land_owner_investor_share_not_for_sale", "total_no_of_apartments"]),
+    "parking": Block("_extract_parking_details", ["open_space_parking_total", "closed_space_parking_total"],
+                     changes=("accordion",)),
+    "bank": Block("_extract_bank_details", ["bank_name", "ifsc_code", "bank_address"]),
+    "complaints": Block("_extract_complaint_details", ["complaint_count", "complaint_numbers"]),
+    "agents": Block("_extract_real_estate_agents", ["real_estate_agent_names", "maharera_certificate_nos"],
+                    changes=("accordion",)),
+}
+
+# Tab name (as matched in _extract_all_tab_data) -> columns it fills
+TAB_FIELDS: Dict[str, List[str]] = {
+    "Partner Details": ["partner_name", "partner_designation"],
+    "Director Details": ["partner_name", "partner_designation"],
+    "Promoter Past Experience": ["promoter_past_project_names", "promoter_past_project_statuses",
+                                 "promoter_past_litigation_statuses"],
+    "Authorised Signatory": ["authorised_signatory_names", "authorised_signatory_designations"],
+    "Single Point of Contact": ["spa_name", "spa_designation"],
+    "Project Professionals": ["architect_names", "engineer_names", "chartered_accountant_names",
+                              "other_professional_names"],
+    "SRO Details": ["sro_name", "sro_document_name"],
+}
+
+# Columns that are not produced by any block
+_PASSTHROUGH_FIELDS = {"project_id", "reg_no"}
+
+
+def resolve_selection(fields: Optional[List[str]] = None,
+                      sections: Optional[List[str]] = None) -> Tuple[List[str], Optional[set]]:
+    """
+    Map requested columns and/or section names to the blocks that must run.
+    Returns (block names in page order, requested columns or None for everything).
+    """
+    if not fields and not sections:
+        return list(EXTRACTION_BLOCKS), None
+
+    unknown_sections = [s for s in sections or [] if s not in EXTRACTION_BLOCKS]
+    if unknown_sections:
+        raise ValueError(f"Unknown section(s): {', '.join(unknown_sections)}. "
+                         f"Available: {', '.join(EXTRACTION_BLOCKS)}")
+
+    field_to_block = {f: name for name, block in EXTRACTION_BLOCKS.items() for f in block.columns}
+    unknown_fields = [f for f in fields or [] if f not in field_to_block and f not in _PASSTHROUGH_FIELDS]
+    if unknown_fields:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown_fields)}")
+
+    wanted = set(fields or [])
+    for section in sections or []:
+        wanted.update(EXTRACTION_BLOCKS[section].columns)
+    needed = {field_to_block[f] for f in wanted if f in field_to_block}
+    return [name for name in EXTRACTION_BLOCKS if name in needed], wanted
+
+
 class DataExtracter:
-    def __init__(self):
+    def __init__(self, fields: Optional[List[str]] = None, sections: Optional[List[str]] = None):
         self.logger = logging.getLogger(__name__)
+        self.fields = fields
+        self.sections = sections
+        # Validate early so a typo fails before any browser work
+        resolve_selection(fields, sections)
+
+    async def extract_project_details(self, page: Page, reg_no: str,
+                                      fields: Optional[List[str]] = None,
+                                      sections: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extract project details from the MahaRERA project page.
+        With `fields` (DESIRED_ORDER columns) and/or `sections` (EXTRACTION_BLOCKS keys),
+        only the blocks producing them run; otherwise the instance defaults apply.
+        """
+        if fields is None and sections is None:
+            fields, sections = self.fields, self.sections
+        blocks, wanted = resolve_selection(fields, sections)
 
-    async def extract_project_details(self, page: Page, reg_no: str) -> Optional[Dict[str, Any]]:
-        """Extract comprehensive project details from the MahaRERA project page."""
         try:
-            await page.wait_for_selector("div.form-card", timeout=10000)
+            with tracer.span("extract.wait_form_card", project=reg_no):
+                await page.wait_for_selector("div.form-card", timeout=budget(10000))
             data = {'reg_no': reg_no}
 
-            tasks = [
-                self._extract_registration_block(page),
-                self._extract_project_details_block(page),
-                self._extract_planning_authority_block(page),
-                self._extract_planning_land_block(page),
-                self._extract_commencement_certificate(page),
-                self._extract_project_address(page),
-                self._extract_promoter_details(page),
-                self._extract_promoter_address(page),
-                self._extract_all_tab_data(page),
-                self._extract_latest_form_dates(page),
-                self.extract_promoter_landowner_details(page),
-                self._extract_investor_flag(page),
-                self._extract_litigation_details(page),
-                self._extract_building_details(page),
-                self._extract_apartment_summary(page),
-                self._extract_parking_details(page),
-                self._extract_bank_details(page),
-                self._extract_complaint_details(page),
-                self._extract_real_estate_agents(page)
-            ]
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for i, result in enumerate(results):
+            block_args = {}
+            if "tabs" in blocks and wanted is not None:
+                block_args["tabs"] = {"tabs": [tab for tab, cols in TAB_FIELDS.items() if wanted.intersection(cols)]}
+
+            results, schedule = await self._run_scheduled(page, blocks, block_args)
+
+            incomplete = [name for name in blocks if isinstance(results.get(name), DeadlineExceeded)]
+            if incomplete:
+                self.logger.warning(f"Project deadline hit for {reg_no}; returning partial data "
+                                    f"without {', '.join(incomplete)}")
+                data["_incomplete_blocks"] = incomplete
+
+            for name in blocks:
+                result = results.get(name)
+                if isinstance(result, DeadlineExceeded):
+                    continue
                 if isinstance(result, Exception):
-                    self.logger.warning(f"A data block extraction failed for {reg_no}: {result}")
+                    self.logger.warning(f"Data block '{name}' extraction failed for {reg_no}: {result}")
                 elif result:
                     data.update(result)
+            data["_schedule"] = schedule
+
+            if wanted is not None:
+                # "_"-prefixed structured rows only come from blocks that ran, so keep them
+                data = {k: v for k, v in data.items()
+                        if k in wanted or k in _PASSTHROUGH_FIELDS or k.startswith("_")}
 
             return data
 
@@ -52,10 +202,61 @@ class DataExtracter:
             self.logger.error(f"Fatal error extracting data for {reg_no}: {e}")
             return None
 
+    async def _run_scheduled(self, page: Page, blocks: List[str],
+                             block_args: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Run the selected blocks concurrently, except that blocks sharing a UI
+        region (Block.changes / Block.reads) take turns on that region, so a
+        tab click or accordion toggle never races a block using the same part
+        of the page and a slow block elsewhere holds nothing up.
+        Returns (results by block, schedule entries with order and timing).
+        """
+        started = time.perf_counter()
+        region_locks = {region: asyncio.Lock() for region in UI_REGIONS}
+        results: Dict[str, Any] = {}
+        schedule: List[Dict[str, Any]] = []
+
+        async def run(name: str):
+            block = EXTRACTION_BLOCKS[name]
+            async with AsyncExitStack() as stack:
+                # Sorted so two blocks never wait on each other's regions
+                for region in sorted(set(block.changes) | set(block.reads)):
+                    await stack.enter_async_context(region_locks[region])
+                await execute(name, block)
+
+        async def execute(name: str, block: Block):
+            entry = {"block": name, "mode": "mutating" if block.mutates else "read-only",
+                     "order": len(schedule), "start_ms": round((time.perf_counter() - started) * 1000)}
+            schedule.append(entry)
+            method = getattr(self, block.method)
+            try:
+                with tracer.span(f"extract.{block.method}", mode=entry["mode"]):
+                    results[name] = await method(page, **block_args.get(name, {}))
+            except Exception as e:
+                results[name] = e
+            finally:
+                entry["end_ms"] = round((time.perf_counter() - started) * 1000)
+
+        tasks = {name: asyncio.create_task(run(name)) for name in blocks}
+        left = remaining()
+        # Stop a little before the project deadline so the blocks that finished are kept
+        timeout = None if left is None else max(0.0, left - DEADLINE_GRACE_S)
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout) if tasks else (set(), set())
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for name, task in tasks.items():
+                if task in pending:
+                    results[name] = DeadlineExceeded("unfinished at project deadline")
+        self.logger.debug("Extraction schedule: " + ", ".join(
+            f"{e['order']}:{e['block']}[{e['start_ms']}-{e['end_ms']}ms]" for e in schedule))
+        return results, schedule
+
     async def _extract_registration_block(self, page: Page) -> Dict[str, str]:
         try:
-            reg_number = await page.locator("label[for='yourUsername']:has-text('Registration Number')").locator("xpath=following-sibling::label[1]").inner_text(timeout=5000)
-            reg_date = await page.locator("label[for='yourUsername']:has-text('Date of Registration')").locator("xpath=following-sibling::label[1]").inner_text(timeout=5000)
+            reg_number = await page.locator("label[for='yourUsername']:has-text('Registration Number')").locator("xpath=following-sibling::label[1]").inner_text(timeout=budget(5000))
+            reg_date = await page.locator("label[for='yourUsername']:has-text('Date of Registration')").locator("xpath=following-sibling::label[1]").inner_text(timeout=budget(5000))
 
             result = {
                 'registration_number': reg_number.strip(),
@@ -81,24 +282,24 @@ class DataExtracter:
         try:
             for key, label in fields.items():
                 
-                await page.wait_for_selector("div:has-text('Project Name')", timeout=10000)
+                await page.wait_for_selector("div:has-text('Project Name')", timeout=budget(10000))
                 locator = page.locator(f"div:text-is('{label}')").nth(0)
                 value_locator = locator.locator("xpath=following-sibling::div[1]")
-                value = await value_locator.inner_text(timeout=5000)
+                value = await value_locator.inner_text(timeout=budget(5000))
                 data[key] = value.strip()
 
             try:
                 ext_label = "Proposed Completion Date (Revised)"
                 ext_locator = page.locator(f"div:text-is('{ext_label}')").nth(0)
                 ext_value_locator = ext_locator.locator("xpath=following-sibling::div[1]")
-                ext_value = await ext_value_locator.inner_text(timeout=3000)
+                ext_value = await ext_value_locator.inner_text(timeout=budget(3000))
                 data['extension_date'] = ext_value.strip()
             except Exception:
                 data['extension_date'] = None
 
             try:
                 status_label = page.locator("span:text-is('Project Status')").first
-                status_value = await status_label.locator("xpath=../../following-sibling::div[1]//span").inner_text(timeout=3000)
+                status_value = await status_label.locator("xpath=../../following-sibling::div[1]//span").inner_text(timeout=budget(3000))
                 data['project_status'] = status_value.strip()
             except Exception:
                 data['project_status'] = None
@@ -117,7 +318,7 @@ class DataExtracter:
         }
         try:
             container = page.locator('div.row:has-text("Planning Authority")').first
-            await container.wait_for(timeout=5000)
+            await container.wait_for(timeout=budget(5000))
             try:
                 label_pa = container.locator('span:has-text("Planning Authority")')
                 value_pa_locator = label_pa.locator("xpath=./ancestor::div[contains(@class, 'col-12 text-font')]/following-sibling::div[1]/p").first
@@ -151,7 +352,7 @@ class DataExtracter:
             }
             section_card = page.locator("div.card-header:has-text('Land Area & Address Details')").first
             form_card = section_card.locator("xpath=ancestor::div[contains(@class, 'form-card')]").first
-            await form_card.wait_for(timeout=5000)
+            await form_card.wait_for(timeout=budget(5000))
             white_boxes = form_card.locator("div.white-box")
             count = await white_boxes.count()
             for key, expected_label in field_map.items():
@@ -162,7 +363,7 @@ class DataExtracter:
                         label = await box.locator("label").inner_text()
                         if expected_label.strip() in label.strip():
                             value_div = box.locator("div.text-font.f-w-700")
-                            await value_div.wait_for(timeout=2000)
+                            await value_div.wait_for(timeout=budget(2000))
                             value = await value_div.inner_text()
                             data[key] = value.strip()
                             found = True
@@ -183,7 +384,7 @@ class DataExtracter:
             section = page.locator("div:has(h5.card-title.mb-0:has-text('Commencement Certificate / NA Order Documents Details'))")
             divOfTable=section.locator("xpath=following-sibling::div[1]");
             table = divOfTable.locator("table:has-text('CC/NA Order Issued to')")
-            await table.wait_for(timeout=5000)
+            await table.wait_for(timeout=budget(5000))
             rows = table.locator("tbody tr")
             count = await rows.count()
             if count == 0 or "No-Data-Found" in (await rows.first.inner_text()):
@@ -213,7 +414,7 @@ class DataExtracter:
 
         try:
             header = page.locator("h5.card-title:has-text('Project Address Details')")
-            await header.wait_for(timeout=10000)
+            await header.wait_for(timeout=budget(10000))
             section = header.locator("xpath=ancestor::div[contains(@class, 'white-box')]")
 
             for label in target_labels:
@@ -228,7 +429,7 @@ class DataExtracter:
                     child_div_locator = value_locator.locator("div")
 
                     if await child_div_locator.count():
-                        await child_div_locator.first.wait_for(timeout=3000)
+                        await child_div_locator.first.wait_for(timeout=budget(3000))
                         value_text = (await child_div_locator.first.text_content() or "").strip()
                     else:
                         value_text = None
@@ -249,9 +450,9 @@ class DataExtracter:
     async def _extract_promoter_details(self, page: Page) -> Dict[str, str]:
         try:
             header = page.locator("h5.card-title:has-text('Promoter Details')").first
-            await header.wait_for(timeout=10000)
+            await header.wait_for(timeout=budget(10000))
             section = header.locator("xpath=ancestor::fieldset[1]")
-            await section.wait_for(timeout=5000)
+            await section.wait_for(timeout=budget(5000))
             outer_row = section.locator("xpath=.//div[contains(@class,'row')][.//label]").first
             cols = outer_row.locator("xpath=.//div[contains(@class,'col')][.//label]")
             total_cols = await cols.count()
@@ -278,7 +479,7 @@ class DataExtracter:
         try:
             header = page.locator("h5:has-text('Promoter Official Communication Address')")
             section = header.locator("xpath=ancestor::fieldset[1]")
-            await section.wait_for(timeout=5000)
+            await section.wait_for(timeout=budget(5000))
             fields_to_extract = ['State/UT', 'District', 'Taluka', 'Village', 'Pin Code']
             for field in fields_to_extract:
                 label_locator = section.locator(f"label:has-text('{field}')")
@@ -295,7 +496,8 @@ class DataExtracter:
             self.logger.warning(f"Could not extract Promoter Address details: {e}")
             return { f"promoter_official_communication_address_{re.sub(r'[^a-z0-9_]', '', field.lower().replace(' ', '_').replace('/', '_'))}": None for field in fields_to_extract }
 
-    async def _extract_all_tab_data(self, page: Page) -> Dict[str, Any]:
+    async def _extract_all_tab_data(self, page: Page, tabs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Click through the detail tabs; with `tabs`, only those tab names are opened."""
         self.logger.info("--- Starting Robust Sequential Tab Extraction ---")
         all_tab_data: Dict[str, Any] = {}
         TAB_SELECTOR_MAP = {
@@ -330,6 +532,8 @@ class DataExtracter:
                 matched_key = next((k for k in TAB_SELECTOR_MAP if k.lower() in tab_name.lower()), None)
                 if not matched_key:
                     continue
+                if tabs is not None and matched_key not in tabs:
+                    continue
 
                 # Safe click only if visible & enabled
                 try:
@@ -355,7 +559,7 @@ class DataExtracter:
                     for sib in sibling_candidates:
                         candidate_table = sib.locator("xpath=.//table").first
                         try:
-                            await candidate_table.wait_for(state="visible", timeout=extra_timeout)
+                            await candidate_table.wait_for(state="visible", timeout=budget(extra_timeout))
                             table_locator = candidate_table
                             break
                         except:
@@ -373,6 +577,8 @@ class DataExtracter:
                             if len(cells) > 2:
                                 names.append((await cells[1].text_content() or "").strip())
                                 desigs.append((await cells[2].text_content() or "").strip())
+                        all_tab_data.setdefault("_partners", []).extend(
+                            {"name": n, "designation": d} for n, d in zip(names, desigs) if n)
                         all_tab_data["partner_name"] = (all_tab_data.get("partner_name", "") + 
                                                         (", " if all_tab_data.get("partner_name") else "") +
                                                         ", ".join(filter(None, names)))
@@ -429,6 +635,9 @@ class DataExtracter:
                                     chartered_accountants.append(prof_name)
                                 else:
                                     others.append(prof_name)
+                                if prof_name:
+                                    all_tab_data.setdefault("_professionals", []).append(
+                                        {"professional_type": prof_type, "name": prof_name})
 
                         all_tab_data["architect_names"] = ", ".join(filter(None, architects))
                         all_tab_data["engineer_names"] = ", ".join(filter(None, engineers))
@@ -464,18 +673,19 @@ class DataExtracter:
             from datetime import datetime
 
             button = page.locator('h2#headingOne >> button[aria-controls="documentLibrary"]')
-            await button.wait_for(state="visible", timeout=7000)
+            await button.wait_for(state="visible", timeout=budget(7000))
 
             table = page.locator('div#documentLibrary table')
             if not await table.is_visible():
                 await button.scroll_into_view_if_needed()
                 await button.click()
-                await table.wait_for(state="visible", timeout=5000)
+                await table.wait_for(state="visible", timeout=budget(5000))
 
             rows = await table.locator('tbody tr').all()
 
             # Track latest dates for Form 1, Form 2, Form 5
             parsed_dates = { "Form 1": None, "Form 2": None, "Form 5": None }
+            documents = []
 
             for row in rows:
                 cells = await row.locator('td').all()
@@ -487,6 +697,15 @@ class DataExtracter:
                     if "occupancy certificate" in document_type.lower():
                         latest_dates["has_occupancy_certificate"] = True
 
+                    # Links for the optional document download stage
+                    form = next((name for name in parsed_dates if name in document_type), None)
+                    link = row.locator("a[href]")
+                    if form and await link.count():
+                        href = await link.first.get_attribute("href")
+                        if href and not href.startswith(("javascript:", "#")):
+                            documents.append({"form": form, "document_type": document_type,
+                                              "created": created_date_str, "url": urljoin(page.url, href)})
+
                     try:
                         current_date = datetime.strptime(created_date_str, '%d/%m/%Y, %I:%M %p')
                         for form_name in parsed_dates.keys():
@@ -502,6 +721,8 @@ class DataExtracter:
                 latest_dates["latest_form2_date"] = parsed_dates["Form 2"].strftime('%d/%m/%Y, %I:%M %p')
             if parsed_dates["Form 5"]:
                 latest_dates["latest_form5_date"] = parsed_dates["Form 5"].strftime('%d/%m/%Y, %I:%M %p')
+            if documents:
+                latest_dates["_documents"] = documents
 
             return latest_dates
 
@@ -513,14 +734,14 @@ class DataExtracter:
         landowner_data = { "promoter_is_landowner": False, "has_other_landowners": False, "landowner_names": None, "landowner_types": None, "landowner_share_types": None }
         try:
             container = page.locator('div.white-box:has-text("Promoter Landowner")')
-            await container.wait_for(state="visible", timeout=7000)
+            await container.wait_for(state="visible", timeout=budget(7000))
             promoter_checkbox = container.locator('div.form-check1:has(label:text-is("Promoter")) input[type="checkbox"]')
             other_landowners_checkbox = container.locator('div.form-check1:has(label:text-is("Promoter Landowner(s)")) input[type="checkbox"]')
             landowner_data["promoter_is_landowner"] = await promoter_checkbox.is_checked()
             landowner_data["has_other_landowners"] = await other_landowners_checkbox.is_checked()
             if landowner_data["has_other_landowners"]:
                 table = container.locator("div.table-responsive > table")
-                await table.wait_for(state="visible", timeout=5000)
+                await table.wait_for(state="visible", timeout=budget(5000))
                 rows = table.locator("tbody tr")
                 row_count = await rows.count()
                 if row_count == 0 or "no record found" in (await rows.first.inner_text()).lower():
@@ -536,6 +757,9 @@ class DataExtracter:
                         names.append(name)
                         types.append(owner_type)
                         shares.append(share_type)
+                        if name:
+                            landowner_data.setdefault("_landowners", []).append(
+                                {"name": name, "owner_type": owner_type, "share_type": share_type})
                 if names:
                     landowner_data["landowner_names"] = ", ".join(filter(None, names))
                     landowner_data["landowner_types"] = ", ".join(filter(None, types))
@@ -549,7 +773,7 @@ class DataExtracter:
         result_key = "are_there_investors_other_than_promoter"
         try:
             container = page.locator("div.col-sm-12:has(label:has-text('Are there any Investor other than the Promoter'))")
-            await container.wait_for(timeout=7000)
+            await container.wait_for(timeout=budget(7000))
             answer_label = container.locator("label.form-label-preview-text > b")
             answer = (await answer_label.inner_text()).strip()
             return {result_key: answer}
@@ -561,14 +785,14 @@ class DataExtracter:
         result_key = "litigation_against_project_count"
         try:
             litigation_container = page.locator("div.white-box:has(b:has-text('Litigation Details'))")
-            await litigation_container.wait_for(timeout=7000)
+            await litigation_container.wait_for(timeout=budget(7000))
             question_container = litigation_container.locator("div:has-text('Is there any litigation against this proposed project :  ')")
             answer_label = question_container.locator("label.form-label-preview-text  ")
             answer_text = (await answer_label.inner_text()).strip().lower()
             if answer_text == "no":
                 return {result_key: 0}
             table = litigation_container.locator("div.table-responsive > table")
-            await table.wait_for(timeout=5000)
+            await table.wait_for(timeout=budget(5000))
             rows = table.locator("tbody > tr")
             row_count = await rows.count()
             if row_count == 1 and ("no data" in (await rows.first.text_content() or "").lower() or "no record" in (await rows.first.text_content() or "").lower()):
@@ -594,18 +818,21 @@ class DataExtracter:
         building_data = {key: [] for key in header_key_map.values()}
         try:
             container = page.locator("div.white-box:has(b:has-text('Building Details'))")
-            await container.wait_for(timeout=7000)
+            await container.wait_for(timeout=budget(7000))
             table = container.locator("table")
-            await table.wait_for(timeout=5000)
+            await table.wait_for(timeout=budget(5000))
             header_elements = await table.locator("thead th").all()
             actual_headers = [(await h.text_content() or "").strip() for h in header_elements]
             actual_headers = [h for h in actual_headers if h != '#']
             rows = await table.locator("tbody tr").all()
+            building_rows = []
             for row in rows:
                 if "Total" in (await row.text_content() or ""):
                     continue
                 cells = await row.locator("td").all()
                 row_cells = cells[1:]
+                row_data = {}
+                building_rows.append(row_data)
                 for i, header_text in enumerate(actual_headers):
                     if i < len(row_cells):
                         cell = row_cells[i]
@@ -615,10 +842,14 @@ class DataExtracter:
                         if normalize(header_text) == normalize("View"):
                             is_visible = await cell.locator("i.bi-eye-fill").count() > 0
                             building_data[dict_key].append(str(is_visible))
+                            row_data[dict_key] = is_visible
                         else:
                             cell_text = (await cell.text_content() or "").strip()
                             building_data[dict_key].append(cell_text)
+                            row_data[dict_key] = cell_text
             final_data = {key: ", ".join(value) for key, value in building_data.items() if value}
+            if building_rows:
+                final_data["_buildings"] = building_rows
             return final_data
         except Exception as e:
             self.logger.error(f"Could not extract building details: {e}")
@@ -637,9 +868,9 @@ class DataExtracter:
         }
         try:
             container = page.locator("div.white-box:has(b:has-text('Summary of Apartments/Units'))")
-            await container.wait_for(timeout=7000)
+            await container.wait_for(timeout=budget(7000))
             table = container.locator("table")
-            await table.wait_for(timeout=5000)
+            await table.wait_for(timeout=budget(5000))
             header_elements = await table.locator("thead th").all()
             header_count = len(header_elements)
             if header_count > 10:
@@ -662,18 +893,24 @@ class DataExtracter:
                 temp_data = {key: [] for key in header_map.values()}
                 actual_headers = [(await h.text_content() or "").strip() for h in header_elements if (await h.text_content() or "").strip() != '#']
                 rows = await table.locator("tbody tr").all()
+                summary_rows = []
                 for row in rows:
                     if "Total" in (await row.text_content() or ""): continue
                     cells = await row.locator("td").all()
                     row_cells = cells[1:]
+                    row_data = {}
+                    summary_rows.append(row_data)
                     for j, header_text in enumerate(actual_headers):
                         if j < len(row_cells):
                             cell = row_cells[j]
                             dict_key = header_map.get(header_text)
                             if dict_key:
-                                temp_data[dict_key].append((await cell.text_content() or "").strip())
+                                cell_text = (await cell.text_content() or "").strip()
+                                temp_data[dict_key].append(cell_text)
+                                row_data[dict_key] = cell_text
                 for key, values in temp_data.items():
                     all_keys[key] = ", ".join(values)
+                all_keys["_unit_summaries"] = summary_rows
             elif header_count == 5:
                 total_apartments = 0
                 rows = await table.locator("tbody tr").all()
@@ -694,12 +931,12 @@ class DataExtracter:
         results = { "open_space_parking_total": None, "closed_space_parking_total": None }
         try:
             button = page.locator("button:has-text('Parking Details')")
-            await button.wait_for(timeout=7000)
+            await button.wait_for(timeout=budget(7000))
             parking_section = page.locator("div#parkingDetails")
             if not "show" in (await parking_section.get_attribute("class") or ""):
                 await button.click()
                 # FIX: Replaced flaky expect with a more reliable wait for the table inside.
-                await parking_section.locator("table").first.wait_for(state="visible", timeout=5000)
+                await parking_section.locator("table").first.wait_for(state="visible", timeout=budget(5000))
             
             tables = parking_section.locator("div.table-responsive > table")
             table_count = await tables.count()
@@ -723,6 +960,8 @@ class DataExtracter:
                         continue
                 open_counts.append(str(open_sum_for_table))
                 closed_counts.append(str(closed_sum_for_table))
+                results.setdefault("_parking", []).append(
+                    {"open_space_total": open_sum_for_table, "closed_space_total": closed_sum_for_table})
             results["open_space_parking_total"] = ", ".join(open_counts)
             results["closed_space_parking_total"] = ", ".join(closed_counts)
             return results
@@ -734,7 +973,7 @@ class DataExtracter:
         result = { "bank_name": None, "ifsc_code": None, "bank_address": None }
         try:
             container = page.locator("project-bank-details-preview fieldset").nth(0)
-            await container.wait_for(timeout=7000)
+            await container.wait_for(timeout=budget(7000))
             fields_to_extract = { "Bank Name": "bank_name", "IFSC Code": "ifsc_code", "Bank Address": "bank_address" }
             for label_text, dict_key in fields_to_extract.items():
                 try:
@@ -754,9 +993,9 @@ class DataExtracter:
         result = { "complaint_count": 0, "complaint_numbers": None }
         try:
             container = page.locator("div.white-box:has(b:has-text('Complaint Details'))")
-            await container.wait_for(timeout=7000)
+            await container.wait_for(timeout=budget(7000))
             table = container.locator("div.table-responsive > table")
-            await table.wait_for(timeout=5000)
+            await table.wait_for(timeout=budget(5000))
             rows = table.locator("tbody tr")
             row_count = await rows.count()
             if row_count == 0 or (row_count == 1 and ("no data" in (await rows.first.text_content() or "").lower() or "no record" in (await rows.first.text_content() or "").lower())):
@@ -772,6 +1011,7 @@ class DataExtracter:
             if complaint_numbers:
                 result["complaint_count"] = len(complaint_numbers)
                 result["complaint_numbers"] = ", ".join(complaint_numbers)
+                result["_complaints"] = complaint_numbers
             return result
         except Exception as e:
             self.logger.warning(f"Could not extract complaint details: {e}")
@@ -781,14 +1021,14 @@ class DataExtracter:
         result = { "real_estate_agent_names": None, "maharera_certificate_nos": None }
         try:
             button = page.locator("button:has-text('Registered Agent(s)')")
-            await button.wait_for(timeout=7000)
+            await button.wait_for(timeout=budget(7000))
             target_id = await button.get_attribute("data-bs-target")
             if not target_id:
                 raise Exception("Could not find 'data-bs-target' on the agent accordion button.")
             table = page.locator(f"{target_id} div.table-responsive > table")
             if not await table.is_visible():
                 await button.click()
-                await table.wait_for(state="visible", timeout=5000)
+                await table.wait_for(state="visible", timeout=budget(5000))
             rows = table.locator("tbody tr")
             row_count = await rows.count()
             if row_count == 0 or (row_count == 1 and ("no data" in (await rows.first.text_content() or "").lower() or "no record" in (await rows.first.text_content() or "").lower())):
@@ -802,6 +1042,8 @@ class DataExtracter:
                     cert_no = (await cells[2].text_content() or "").strip()
                     if name: agent_names.append(name)
                     if cert_no: cert_numbers.append(cert_no)
+                    if name or cert_no:
+                        result.setdefault("_agents", []).append({"name": name, "certificate_no": cert_no})
             if agent_names: result["real_estate_agent_names"] = ", ".join(agent_names)
             if cert_numbers: result["maharera_certificate_nos"] = ", ".join(cert_numbers)
             return result
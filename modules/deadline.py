@@ -0,0 +1,88 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+_current: ContextVar[Optional["Deadline"]] = ContextVar("project_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The current project's time budget is used up."""
+
+
+class Deadline:
+    """
+    Per-project time budget. Activate it with `with deadline:`; every wait that
+    goes through `budget()` or `within_deadline()` in that context (including
+    tasks started from it, e.g. under asyncio.gather) draws from the same budget.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._paused_at = None
+        self._tokens = []
+
+    def remaining(self) -> float:
+        now = self._paused_at if self._paused_at is not None else time.monotonic()
+        return self.expires_at - now
+
+    def pause(self):
+        """Stop the clock, e.g. while a prepared project waits for its turn to extract."""
+        if self._paused_at is None:
+            self._paused_at = time.monotonic()
+
+    def resume(self):
+        if self._paused_at is not None:
+            self.expires_at += time.monotonic() - self._paused_at
+            self._paused_at = None
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def __enter__(self):
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *exc):
+        _current.reset(self._tokens.pop())
+        return False
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left on the current deadline, or None if there is none."""
+    deadline = _current.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def budget(timeout_ms: float) -> float:
+    """
+    Cap a Playwright timeout (ms) to what is left of the current project's budget.
+    Raises DeadlineExceeded once the budget is gone.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return timeout_ms
+    left_ms = deadline.remaining() * 1000
+    if left_ms <= 0:
+        raise DeadlineExceeded(f"project deadline of {deadline.seconds:g}s exceeded")
+    return max(1, min(timeout_ms, int(left_ms)))
+
+
+async def within_deadline(coro):
+    """Await `coro`, cancelling it if the current deadline runs out first."""
+    deadline = _current.get()
+    if deadline is None:
+        return await coro
+    left = deadline.remaining()
+    if left <= 0:
+        coro.close()
+        raise DeadlineExceeded(f"project deadline of {deadline.seconds:g}s exceeded")
+    try:
+        return await asyncio.wait_for(coro, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"project deadline of {deadline.seconds:g}s exceeded") from None
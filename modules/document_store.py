@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+import aiofiles
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS_DIR = "documents"
+CHUNK_SIZE = 64 * 1024
+
+
+class DocumentDownloader:
+    """
+    Background download of the Form 1/2/5 PDFs listed in a project's document library.
+
+    Files stream to `<dir>/partial/<url hash>.part` in CHUNK_SIZE pieces, so
+    memory stays bounded and an interrupted download resumes with a Range
+    request. Completed files are stored once per content hash under
+    `<dir>/by_hash/`, so the same PDF linked from several projects is kept
+    once. `manifest.jsonl` maps (project, form, url) to the stored file, and
+    URLs already in it are not downloaded again. Downloads run as tasks
+    independent of extraction; failures are logged and recorded, never raised.
+    """
+
+    def __init__(self, directory: str = DOCUMENTS_DIR, concurrency: int = 4, max_attempts: int = 3,
+                 client: Optional[httpx.AsyncClient] = None):
+        self.directory = directory
+        self.max_attempts = max_attempts
+        self.manifest_path = os.path.join(directory, "manifest.jsonl")
+        self.client = client or httpx.AsyncClient(timeout=60, follow_redirects=True,
+                                                  headers={"User-Agent": "Mozilla/5.0"})
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+        self._active: Dict[str, asyncio.Future] = {}
+        self.known = self._load_manifest()
+        self.stats = {"downloaded": 0, "deduplicated": 0, "skipped": 0, "failed": 0, "bytes": 0}
+        os.makedirs(os.path.join(directory, "partial"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "by_hash"), exist_ok=True)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        """URL -> sha256 of every document already stored."""
+        known = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        if entry.get("sha256"):
+                            known[entry["url"]] = entry["sha256"]
+        return known
+
+    def schedule(self, project_id: Any, documents: List[Dict[str, Any]], cookies: Optional[Dict[str, str]] = None):
+        """Start downloading a project's documents without waiting for them."""
+        task = asyncio.create_task(self.download_project(project_id, documents, cookies))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def download_project(self, project_id: Any, documents: List[Dict[str, Any]],
+                               cookies: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        results = await asyncio.gather(*(self._download_one(project_id, doc, cookies) for doc in documents))
+        done = sum(1 for r in results if r.get("sha256"))
+        logger.info(f"Project {project_id}: {done}/{len(documents)} documents stored.")
+        return results
+
+    async def _download_one(self, project_id: Any, doc: Dict[str, Any],
+                            cookies: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        url = doc["url"]
+        entry = {"project_id": project_id, "form": doc.get("form"), "document_type": doc.get("document_type"),
+                 "created": doc.get("created"), "url": url, "sha256": None, "path": None, "error": None}
+        try:
+            if url in self.known:
+                self.stats["skipped"] += 1
+                entry["sha256"] = self.known[url]
+            elif url in self._active:
+                # Another project is fetching the same URL right now
+                entry["sha256"] = await asyncio.shield(self._active[url])
+            else:
+                future = asyncio.get_running_loop().create_future()
+                self._active[url] = future
+                try:
+                    entry["sha256"] = await self._fetch(url, cookies)
+                    future.set_result(entry["sha256"])
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved; waiters re-raise it themselves
+                    raise
+                finally:
+                    self._active.pop(url, None)
+                self.known[url] = entry["sha256"]
+            entry["path"] = self._stored_path(entry["sha256"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            entry["error"] = f"{type(e).__name__}: {e}"
+            logger.warning(f"Document download failed for project {project_id} ({url}): {entry['error']}")
+
+        entry["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        async with aiofiles.open(self.manifest_path, "a", encoding="utf-8") as f:
+            await f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def _stored_path(self, sha256: str) -> str:
+        return os.path.join(self.directory, "by_hash", sha256[:2], f"{sha256}.pdf")
+
+    async def _fetch(self, url: str, cookies: Optional[Dict[str, str]]) -> str:
+        part = os.path.join(self.directory, "partial", hashlib.sha1(url.encode()).hexdigest() + ".part")
+        last_error: Optional[Exception] = None
+        async with self._slots:
+            for attempt in range(self.max_attempts):
+                try:
+                    return await self._stream(url, part, cookies)
+                except (httpx.HTTPError, OSError) as e:
+                    last_error = e
+                    if attempt + 1 < self.max_attempts:
+                        await asyncio.sleep(2 ** attempt)
+        raise last_error
+
+    async def _stream(self, url: str, part: str, cookies: Optional[Dict[str, str]]) -> str:
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        async with self.client.stream("GET", url, headers=headers, cookies=cookies) as resp:
+            if resp.status_code == 416 and offset:
+                # Part file already holds the whole document
+                pass
+            else:
+                resp.raise_for_status()
+                if offset and resp.status_code != 206:
+                    offset = 0  # server ignored the Range header; start over
+                async with aiofiles.open(part, "ab" if offset else "wb") as f:
+                    async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                        await f.write(chunk)
+                        self.stats["bytes"] += len(chunk)
+
+        # Hash the finished file in a thread so large PDFs don't stall the event loop
+        sha256 = await asyncio.to_thread(_file_sha256, part)
+        target = self._stored_path(sha256)
+        if os.path.exists(target):
+            os.remove(part)
+            self.stats["deduplicated"] += 1
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(part, target)
+            self.stats["downloaded"] += 1
+        return sha256
+
+    async def close(self):
+        """Wait for scheduled downloads, then release the HTTP client."""
+        if self._tasks:
+            logger.info(f"Waiting for {len(self._tasks)} project document downloads to finish...")
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.client.aclose()
+        logger.info(f"Document downloads: {self.stats}")
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
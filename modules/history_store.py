@@ -0,0 +1,155 @@
+import json
+import sqlite3
+import time
+import zlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILENAME = "project_history.sqlite"
+
+# Values longer than this are stored zlib-compressed
+COMPRESS_OVER = 96
+
+
+def _encode(value: Any) -> Optional[Union[str, bytes]]:
+    if value is None:
+        return None
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(text) > COMPRESS_OVER:
+        return zlib.compress(text.encode("utf-8"), 9)
+    return text
+
+
+def _decode(value: Optional[Union[str, bytes]]) -> Optional[str]:
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+def to_timestamp(when: Union[str, int, float, datetime, None]) -> int:
+    """Epoch seconds from a datetime, an epoch number or an ISO date/datetime string."""
+    if when is None:
+        return int(time.time())
+    if isinstance(when, datetime):
+        return int(when.timestamp())
+    if isinstance(when, (int, float)):
+        return int(when)
+    text = str(when).strip()
+    if text.isdigit():
+        return int(text)
+    parsed = datetime.fromisoformat(text)
+    if len(text) == 10:
+        # A bare date means "as of the end of that day"
+        return int(parsed.timestamp()) + 86399
+    return int(parsed.timestamp())
+
+
+class HistoryStore:
+    """
+    Per-project time series of scraped fields, stored as deltas.
+
+    Each scrape adds one `snapshots` row (project, time, number of changed
+    fields) and one `history` row per field whose value differs from the
+    project's previous snapshot; unchanged fields cost nothing. `history` is a
+    WITHOUT ROWID table keyed (field_id, project_id, scraped_at), so rows are
+    physically sorted by field, then project, then time: "all changes in field
+    F" is one range scan, and a secondary (project_id, scraped_at) index
+    serves "state of project X as of D". Field names are interned in `fields`
+    and long values are zlib-compressed.
+    """
+
+    def __init__(self, path: str = HISTORY_FILENAME):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fields (field_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+            CREATE TABLE IF NOT EXISTS snapshots (
+                project_id INTEGER NOT NULL, scraped_at INTEGER NOT NULL, changed INTEGER NOT NULL,
+                PRIMARY KEY (project_id, scraped_at)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS history (
+                field_id INTEGER NOT NULL, project_id INTEGER NOT NULL, scraped_at INTEGER NOT NULL, value,
+                PRIMARY KEY (field_id, project_id, scraped_at)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_history_project ON history (project_id, scraped_at);
+        """)
+        self._field_ids: Dict[str, int] = dict(self.conn.execute("SELECT name, field_id FROM fields"))
+
+    def _field_id(self, name: str) -> int:
+        if name not in self._field_ids:
+            cur = self.conn.execute("INSERT INTO fields (name) VALUES (?)", [name])
+            self._field_ids[name] = cur.lastrowid
+        return self._field_ids[name]
+
+    def _latest_raw(self, project_id: int, at: Optional[int] = None) -> Dict[int, Any]:
+        """field_id -> stored value of the project's state at `at` (default: latest)."""
+        rows = self.conn.execute(
+            "SELECT field_id, value, MAX(scraped_at) FROM history "
+            "WHERE project_id = ? AND scraped_at <= ? GROUP BY field_id",
+            [project_id, at if at is not None else 2**62])
+        return {field_id: value for field_id, value, _ in rows}
+
+    def add(self, record: Dict[str, Any], scraped_at: Optional[float] = None) -> int:
+        """Record one scrape; returns how many fields changed."""
+        project_id = record.get("project_id")
+        if project_id is None:
+            return 0
+        project_id = int(project_id)
+        scraped_at = to_timestamp(scraped_at)
+        previous = self._latest_raw(project_id)
+
+        changes = []
+        # "_" keys are child rows and run metadata, not fields, as in the CSV output.
+        # Keys missing from a partial (--fields) record are not treated as removed.
+        for name, value in record.items():
+            if name.startswith("_") or name == "project_id":
+                continue
+            field_id = self._field_id(name)
+            encoded = _encode(value)
+            if field_id in previous and _decode(previous[field_id]) == _decode(encoded):
+                continue
+            if field_id not in previous and encoded is None:
+                continue
+            changes.append((field_id, project_id, scraped_at, encoded))
+
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany("INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?)", changes)
+            self.conn.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                              [project_id, scraped_at, len(changes)])
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return len(changes)
+
+    def as_of(self, project_id: int, when: Union[str, int, float, datetime, None] = None) -> Dict[str, Any]:
+        """The project's fields as they stood at `when` (default: now)."""
+        names = {field_id: name for name, field_id in self._field_ids.items()}
+        state = {names[field_id]: _decode(value)
+                 for field_id, value in self._latest_raw(int(project_id), to_timestamp(when)).items()}
+        return {k: v for k, v in state.items() if v is not None}
+
+    def changes(self, field: str, project_id: Optional[int] = None,
+                since: Union[str, int, float, datetime, None] = None) -> List[Dict[str, Any]]:
+        """Every recorded change of `field`, sorted by project then time."""
+        field_id = self._field_ids.get(field)
+        if field_id is None:
+            return []
+        sql = "SELECT project_id, scraped_at, value FROM history WHERE field_id = ?"
+        params: List[Any] = [field_id]
+        if project_id is not None:
+            sql += " AND project_id = ?"
+            params.append(int(project_id))
+        if since is not None:
+            sql += " AND scraped_at >= ?"
+            params.append(to_timestamp(since))
+        sql += " ORDER BY project_id, scraped_at"
+        return [{"project_id": pid, "scraped_at": datetime.fromtimestamp(ts).isoformat(),
+                 "value": _decode(value)}
+                for pid, ts, value in self.conn.execute(sql, params)]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,208 @@
+import asyncio
+import base64
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PORTAL_URL = "https://maharerait.maharashtra.gov.in"
+
+# XHRs the Angular project view issues. These mirror the browser's network
+# panel and are the only thing to update when the portal changes its API.
+CAPTCHA_ENDPOINT = "/api/maha-rera-public-view-project-registration-service/public/captcha/generate"
+CAPTCHA_VERIFY_ENDPOINT = "/api/maha-rera-public-view-project-registration-service/public/captcha/verify"
+DATA_ENDPOINTS = {
+    "project": "/api/maha-rera-public-view-project-registration-service/public/projectregistartion/getProjectGeneralDetailsByProjectId/{project_id}",
+    "promoter": "/api/maha-rera-public-view-project-registration-service/public/projectregistartion/getPromoterDetailsByProjectId/{project_id}",
+    "land": "/api/maha-rera-public-view-project-registration-service/public/projectregistartion/getProjectLandDetailsByProjectId/{project_id}",
+    "buildings": "/api/maha-rera-public-view-project-registration-service/public/projectregistartion/getBuildingDetailsByProjectId/{project_id}",
+    "bank": "/api/maha-rera-public-view-project-registration-service/public/projectregistartion/getBankDetailsByProjectId/{project_id}",
+}
+
+# Output column -> (section in DATA_ENDPOINTS, key path inside that section's
+# payload). Only these columns are produced over HTTP; each comes from exactly
+# one place, so nested lists (past projects, partners) never leak into them.
+COLUMN_PATHS = {
+    "registration_number": ("project", ("projectRegistrationNo",)),
+    "date_of_registration": ("project", ("registrationDate",)),
+    "project_name": ("project", ("projectName",)),
+    "project_type": ("project", ("projectTypeName",)),
+    "project_location": ("project", ("projectLocation",)),
+    "proposed_completion_date": ("project", ("originalProposedCompletionDate",)),
+    "extension_date": ("project", ("revisedProposedCompletionDate",)),
+    "project_status": ("project", ("projectStatusName",)),
+    "planning_authority": ("project", ("planningAuthorityName",)),
+    "full_name_of_planning_authority": ("project", ("planningAuthorityFullName",)),
+    "project_address_state_ut": ("project", ("projectAddress", "stateName")),
+    "project_address_district": ("project", ("projectAddress", "districtName")),
+    "project_address_taluka": ("project", ("projectAddress", "talukaName")),
+    "project_address_village": ("project", ("projectAddress", "villageName")),
+    "project_address_pin_code": ("project", ("projectAddress", "pinCode")),
+    "promoter_details": ("promoter", ("promoterName",)),
+    "promoter_official_communication_address_state_ut": ("promoter", ("officeAddress", "stateName")),
+    "promoter_official_communication_address_district": ("promoter", ("officeAddress", "districtName")),
+    "promoter_official_communication_address_taluka": ("promoter", ("officeAddress", "talukaName")),
+    "promoter_official_communication_address_village": ("promoter", ("officeAddress", "villageName")),
+    "promoter_official_communication_address_pin_code": ("promoter", ("officeAddress", "pinCode")),
+    "final_plot_bearing": ("land", ("finalPlotBearingNo",)),
+    "total_land_area": ("land", ("totalLandArea",)),
+    "land_area_applied": ("land", ("landAreaApplied",)),
+    "permissible_builtup": ("land", ("permissibleBuiltUpArea",)),
+    "sanctioned_builtup": ("land", ("sanctionedBuiltUpArea",)),
+    "aggregate_open_space": ("land", ("aggregateOpenSpaceArea",)),
+    "bank_name": ("bank", ("bankName",)),
+    "ifsc_code": ("bank", ("ifscCode",)),
+    "bank_address": ("bank", ("bankAddress",)),
+}
+
+# Columns filled in by the caller rather than read from the API
+_PASSTHROUGH = ("project_id", "reg_no")
+
+# Wrappers the API puts around the actual object
+ENVELOPE_KEYS = ("responseObject", "data", "result")
+
+
+def uncovered_columns(columns: Iterable[str]) -> List[str]:
+    """Requested columns HTTP mode cannot produce (no COLUMN_PATHS entry)."""
+    return sorted(set(columns) - set(_PASSTHROUGH) - set(COLUMN_PATHS))
+
+
+class HttpModeUnavailable(Exception):
+    """The browserless path could not produce a trustworthy record; use the browser."""
+
+
+def unwrap_envelope(payload: Any) -> Any:
+    while isinstance(payload, dict) and len(payload) <= 3:
+        inner = next((payload[k] for k in ENVELOPE_KEYS if k in payload), None)
+        if inner is None:
+            break
+        payload = inner
+    return payload
+
+
+def _lookup(payload: Any, path: Tuple[str, ...]) -> Any:
+    """Value at `path`; a missing key means the API no longer matches COLUMN_PATHS."""
+    value = payload
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            raise HttpModeUnavailable(f"API response lacks {'.'.join(path)}")
+        value = value[key]
+    if isinstance(value, (dict, list)):
+        raise HttpModeUnavailable(f"{'.'.join(path)} is not a scalar")
+    return value
+
+
+def _leaves(value: Any, out: Dict[str, Any]):
+    """First scalar per key anywhere in `value` (for the captcha response only)."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                _leaves(item, out)
+            elif item not in (None, ""):
+                out.setdefault(key.lower(), item)
+    elif isinstance(value, list):
+        for item in value:
+            _leaves(item, out)
+
+
+def _decode_image(payload: Any) -> Tuple[Optional[str], bytes]:
+    """Pull (captcha id, PNG bytes) out of a JSON captcha response."""
+    leaves: Dict[str, Any] = {}
+    _leaves(payload, leaves)
+    token = next((str(leaves[k]) for k in ("captchaid", "id", "token", "uuid") if k in leaves), None)
+    for key in ("captchaimage", "image", "captcha", "data"):
+        value = leaves.get(key)
+        if isinstance(value, str) and len(value) > 100:
+            return token, base64.b64decode(value.split(",", 1)[-1])
+    raise HttpModeUnavailable("captcha response had no image")
+
+
+class HttpProjectClient:
+    """
+    Browserless scraper that replays the project view's own calls with httpx:
+    fetch the captcha image, answer it with CaptchaSolver, call the data
+    endpoints and map their JSON onto DataExtracter's column names via
+    COLUMN_PATHS. It only answers when every requested column has a path
+    (`uncovered` is empty) and every path is present in the response; anything
+    else raises HttpModeUnavailable so the caller falls back to the browser.
+    """
+
+    def __init__(self, captcha_solver, columns: Iterable[str], max_captcha_attempts: int = 3,
+                 client: Optional[httpx.AsyncClient] = None):
+        self.captcha_solver = captcha_solver
+        self.columns = set(columns) - set(_PASSTHROUGH)
+        self.uncovered = uncovered_columns(self.columns)
+        self.sections = sorted({COLUMN_PATHS[c][0] for c in self.columns if c in COLUMN_PATHS})
+        self.max_captcha_attempts = max_captcha_attempts
+        self.client = client or httpx.AsyncClient(
+            base_url=PORTAL_URL, timeout=20, follow_redirects=True,
+            headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json, text/plain, */*"},
+        )
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def _solve_captcha(self, project_id: int) -> Dict[str, str]:
+        """Returns extra headers carrying the verified captcha session."""
+        for attempt in range(1, self.max_captcha_attempts + 1):
+            resp = await self.client.get(CAPTCHA_ENDPOINT)
+            if resp.status_code != 200:
+                raise HttpModeUnavailable(f"captcha endpoint returned {resp.status_code}")
+
+            if resp.headers.get("content-type", "").startswith("image/"):
+                token, image = resp.headers.get("captcha-id"), resp.content
+            else:
+                token, image = _decode_image(resp.json())
+
+            try:
+                answer = await self.captcha_solver.extract_text(image)
+            except Exception as e:
+                # Undecodable image (PIL raises OSError) or an OCR failure
+                raise HttpModeUnavailable(f"captcha OCR failed: {type(e).__name__}: {e}") from e
+            if not answer:
+                continue
+
+            verify = await self.client.post(CAPTCHA_VERIFY_ENDPOINT, json={
+                "captchaId": token, "captcha": answer, "projectId": project_id})
+            await self.captcha_solver.record(image, answer, verify.status_code == 200, source="http")
+            if verify.status_code == 200:
+                body = verify.json() if verify.content else {}
+                auth = (body.get("token") or body.get("accessToken")) if isinstance(body, dict) else None
+                return {"Authorization": f"Bearer {auth}"} if auth else {}
+            logger.info(f"HTTP captcha attempt {attempt} rejected for {project_id}")
+        raise HttpModeUnavailable("captcha not accepted over HTTP")
+
+    def build_record(self, sections: Dict[str, Any]) -> Dict[str, Any]:
+        payloads = {name: unwrap_envelope(payload) for name, payload in sections.items()}
+        record: Dict[str, Any] = {}
+        for column in sorted(self.columns):
+            section, path = COLUMN_PATHS[column]
+            value = _lookup(payloads.get(section), path)
+            record[column] = str(value).strip() if value not in (None, "") else None
+        if "registration_number" in record and not record["registration_number"]:
+            raise HttpModeUnavailable("API response has an empty registration number")
+        return record
+
+    async def scrape(self, project_id: int) -> Dict[str, Any]:
+        if self.uncovered:
+            raise HttpModeUnavailable(f"no API mapping for {len(self.uncovered)} requested column(s), "
+                                      f"e.g. {', '.join(self.uncovered[:3])}")
+        try:
+            headers = await self._solve_captcha(project_id)
+            responses = await asyncio.gather(*(
+                self.client.get(DATA_ENDPOINTS[name].format(project_id=project_id), headers=headers)
+                for name in self.sections))
+            sections = {}
+            for name, resp in zip(self.sections, responses):
+                if resp.status_code != 200:
+                    raise HttpModeUnavailable(f"{name} endpoint returned {resp.status_code}")
+                sections[name] = resp.json()
+        except (httpx.HTTPError, ValueError, OSError) as e:
+            raise HttpModeUnavailable(f"{type(e).__name__}: {e}") from e
+
+        record = self.build_record(sections)
+        record["reg_no"] = str(project_id)
+        record["project_id"] = project_id
+        return record
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+import logging
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+BITMAP_FILENAME = "project_ids.bitmap"
+
+# Markers the portal returns instead of a project when the ID does not exist.
+INVALID_MARKERS = ("project not found", "no record found", "invalid project")
+
+# Redirect targets that mean "no such project"; any other redirect is inconclusive.
+NOT_FOUND_PATHS = ("/404", "/not-found", "/notfound", "/page-not-found")
+
+# Discovery stops once at least this many probes ran and nearly all told nothing
+INCONCLUSIVE_SAMPLE = 64
+INCONCLUSIVE_LIMIT = 0.95
+
+_MAGIC = b"MRBM1"
+
+
+class ProbesInconclusive(Exception):
+    """Nearly every probe was inconclusive (e.g. the endpoint now wants a captcha)."""
+
+
+class IdBitmap:
+    """Two packed bitsets (known-valid / known-invalid) indexed by project ID."""
+
+    def __init__(self, size: int = 0):
+        nbytes = (size + 7) // 8
+        self.valid = bytearray(nbytes)
+        self.invalid = bytearray(nbytes)
+
+    def _grow(self, project_id: int):
+        needed = project_id // 8 + 1
+        if needed > len(self.valid):
+            extra = needed - len(self.valid)
+            self.valid.extend(bytes(extra))
+            self.invalid.extend(bytes(extra))
+
+    @staticmethod
+    def _get(bits: bytearray, project_id: int) -> bool:
+        idx = project_id >> 3
+        return idx < len(bits) and bool(bits[idx] & (1 << (project_id & 7)))
+
+    def mark(self, project_id: int, is_valid: bool):
+        self._grow(project_id)
+        idx, bit = project_id >> 3, 1 << (project_id & 7)
+        if is_valid:
+            self.valid[idx] |= bit
+            self.invalid[idx] &= ~bit
+        else:
+            self.invalid[idx] |= bit
+            self.valid[idx] &= ~bit
+
+    def status(self, project_id: int) -> Optional[bool]:
+        """True if known valid, False if known invalid, None if never probed."""
+        if self._get(self.valid, project_id):
+            return True
+        if self._get(self.invalid, project_id):
+            return False
+        return None
+
+    def iter_valid(self, start: int = 0, end: Optional[int] = None) -> Iterator[int]:
+        end = len(self.valid) * 8 - 1 if end is None else end
+        for project_id in range(start, end + 1):
+            if self._get(self.valid, project_id):
+                yield project_id
+
+    def counts(self) -> tuple:
+        return (sum(bin(b).count("1") for b in self.valid),
+                sum(bin(b).count("1") for b in self.invalid))
+
+    def save(self, path: str = BITMAP_FILENAME):
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(struct.pack("<I", len(self.valid)))
+            f.write(self.valid)
+            f.write(self.invalid)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = BITMAP_FILENAME) -> "IdBitmap":
+        bitmap = cls()
+        if not os.path.exists(path):
+            return bitmap
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a project ID bitmap")
+            (nbytes,) = struct.unpack("<I", f.read(4))
+            bitmap.valid = bytearray(f.read(nbytes))
+            bitmap.invalid = bytearray(f.read(nbytes))
+        return bitmap
+
+
+async def probe_project_id(client: httpx.AsyncClient, project_id: int) -> Optional[bool]:
+    """
+    Cheap existence check for a project ID without solving the captcha.
+    The view page is an Angular shell that answers 200 for any ID, so this
+    asks the project-details XHR the page itself calls. Returns None when the
+    response does not tell IDs apart: captcha/auth required, server errors,
+    non-JSON bodies, empty envelopes and redirects anywhere but a known
+    not-found page. Only an explicit not-found signal returns False, since an
+    ID marked invalid is never probed again.
+    """
+    import httpx
+    from modules.http_client import DATA_ENDPOINTS, PORTAL_URL, unwrap_envelope
+
+    url = PORTAL_URL + DATA_ENDPOINTS["project"].format(project_id=project_id)
+    try:
+        resp = await client.get(url, follow_redirects=False, headers={"Accept": "application/json"})
+    except httpx.HTTPError as e:
+        logger.warning(f"Probe failed for {project_id}: {e}")
+        return None
+
+    if resp.status_code in (404, 410):
+        return False
+    if 300 <= resp.status_code < 400:
+        location = resp.headers.get("location", "").lower()
+        return False if any(path in location for path in NOT_FOUND_PATHS) else None
+    if resp.status_code != 200:
+        return None
+
+    try:
+        payload = resp.json()
+    except ValueError:
+        return None
+    project = unwrap_envelope(payload)
+    if isinstance(project, dict) and project.get("projectRegistrationNo"):
+        return True
+    if any(marker in resp.text.lower() for marker in INVALID_MARKERS):
+        return False
+    # Anything else, e.g. {"status": "FAILURE", "message": "captcha not verified",
+    # "responseObject": null}, says nothing about the ID itself
+    return None
+
+
+class IdDiscoverer:
+    """
+    Gap-aware sparse prober.
+    Walks the ID space with a stride that doubles across empty stretches and
+    resets on a hit; every hit is expanded densely in both directions until
+    `gap_tolerance` consecutive misses, so clusters are found without probing
+    every ID in long dead ranges.
+    """
+
+    def __init__(self, bitmap: IdBitmap, stride: int = 8, max_stride: int = 512,
+                 gap_tolerance: int = 16, concurrency: int = 8):
+        self.bitmap = bitmap
+        self.stride = stride
+        self.max_stride = max_stride
+        self.gap_tolerance = gap_tolerance
+        self.concurrency = concurrency
+        self.probes = 0
+        self.inconclusive = 0
+
+    async def _check_many(self, client: httpx.AsyncClient, ids: List[int]) -> List[Optional[bool]]:
+        results: List[Optional[bool]] = []
+        pending = []
+        for project_id in ids:
+            known = self.bitmap.status(project_id)
+            results.append(known)
+            if known is None:
+                pending.append((len(results) - 1, project_id))
+
+        if pending:
+            probed = await asyncio.gather(*(probe_project_id(client, pid) for _, pid in pending))
+            self.probes += len(pending)
+            for (idx, project_id), outcome in zip(pending, probed):
+                results[idx] = outcome
+                if outcome is None:
+                    self.inconclusive += 1
+                else:
+                    self.bitmap.mark(project_id, outcome)
+            if self.probes >= INCONCLUSIVE_SAMPLE and self.inconclusive >= self.probes * INCONCLUSIVE_LIMIT:
+                raise ProbesInconclusive(f"{self.inconclusive} of {self.probes} probes were inconclusive; "
+                                         f"the probe endpoint no longer tells project IDs apart")
+        return results
+
+    async def _expand(self, client: httpx.AsyncClient, origin: int, direction: int, limit: int) -> int:
+        """Scan densely from origin until gap_tolerance misses in a row. Returns last ID touched."""
+        misses = 0
+        cursor = origin
+        while misses < self.gap_tolerance:
+            window = []
+            for _ in range(self.concurrency):
+                cursor += direction
+                if (direction > 0 and cursor > limit) or (direction < 0 and cursor < limit):
+                    break
+                window.append(cursor)
+            if not window:
+                break
+            for outcome in await self._check_many(client, window):
+                misses = 0 if outcome else misses + 1
+        return cursor
+
+    async def discover(self, start: int, end: int) -> IdBitmap:
+        import httpx
+
+        headers = {"User-Agent": "Mozilla/5.0"}
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(headers=headers, limits=limits, timeout=10) as client:
+            step = self.stride
+            previous = start - 1
+            project_id = start
+            while project_id <= end:
+                (hit,) = await self._check_many(client, [project_id])
+                if hit:
+                    await self._expand(client, project_id, -1, previous + 1)
+                    previous = await self._expand(client, project_id, 1, end)
+                    step = self.stride
+                    project_id = previous + step
+                    continue
+                previous = project_id
+                step = min(step * 2, self.max_stride)
+                project_id += step
+
+        valid, invalid = self.bitmap.counts()
+        logger.info(f"Discovery done: {self.probes} probes ({self.inconclusive} inconclusive), "
+                    f"{valid} valid / {invalid} invalid IDs known.")
+        if self.probes and self.inconclusive > self.probes // 2:
+            logger.warning(f"Most probes ({self.inconclusive}/{self.probes}) were inconclusive; "
+                           f"the bitmap may be far from complete.")
+        return self.bitmap
+
+
+async def discover_ids(start: int, end: int, path: str = BITMAP_FILENAME, **kwargs) -> IdBitmap:
+    bitmap = IdBitmap.load(path)
+    try:
+        await IdDiscoverer(bitmap, **kwargs).discover(start, end)
+    finally:
+        bitmap.save(path)
+    return bitmap
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Packages that must not load just by importing the CLI
+HEAVY_PACKAGES = ("pandas", "playwright", "playwright_stealth", "selectolax", "requests", "httpx",
+                  "cv2", "numpy", "PIL", "pytesseract", "aiofiles", "duckdb", "langchain")
+
+
+def measure(target: str = "main", cwd: Optional[str] = None) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every import made by `import target`, via -X importtime."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                          cwd=cwd or os.getcwd(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.strip(), int(own), int(cumulative)))
+    return entries
+
+
+def summarise(entries: List[Tuple[str, int, int]], top: int = 10) -> Dict[str, object]:
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, own, _ in entries:
+        by_package[name.split(".")[0]] += own
+    loaded = {name.split(".")[0] for name, _, _ in entries}
+    return {
+        "total_ms": round(sum(own for _, own, _ in entries) / 1000, 1),
+        "modules": len(entries),
+        "packages": sorted(((pkg, round(us / 1000, 1)) for pkg, us in by_package.items()),
+                           key=lambda item: -item[1])[:top],
+        "slowest": sorted(((name, round(cum / 1000, 1)) for name, _, cum in entries),
+                          key=lambda item: -item[1])[:top],
+        "heavy_loaded": sorted(pkg for pkg in HEAVY_PACKAGES if pkg in loaded),
+    }
+
+
+def report(target: str = "main", top: int = 10, budget_ms: Optional[float] = None,
+           cwd: Optional[str] = None) -> int:
+    """
+    Print an import-time summary of `target` and return an exit status:
+    non-zero if a HEAVY_PACKAGES entry loads at import or the total exceeds `budget_ms`.
+    """
+    summary = summarise(measure(target, cwd), top)
+    print(f"import {target}: {summary['total_ms']} ms across {summary['modules']} modules")
+    print("\nBy top-level package (self time):")
+    for pkg, ms in summary["packages"]:
+        print(f"  {ms:>9.1f} ms  {pkg}")
+    print("\nSlowest imports (cumulative):")
+    for name, ms in summary["slowest"]:
+        print(f"  {ms:>9.1f} ms  {name}")
+
+    status = 0
+    if summary["heavy_loaded"]:
+        print(f"\nFAIL: heavy packages loaded at startup: {', '.join(summary['heavy_loaded'])}")
+        status = 1
+    if budget_ms is not None and summary["total_ms"] > budget_ms:
+        print(f"\nFAIL: {summary['total_ms']} ms is over the {budget_ms:g} ms budget")
+        status = 1
+    if status == 0:
+        print("\nOK")
+    return status
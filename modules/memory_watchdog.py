@@ -0,0 +1,139 @@
+import asyncio
+import os
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _children() -> Dict[int, List[int]]:
+    tree: Dict[int, List[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # comm may contain spaces; fields resume after the last ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        tree.setdefault(ppid, []).append(int(name))
+    return tree
+
+
+def descendants(pid: int) -> List[int]:
+    """Every process below `pid` (Playwright driver, Chromium and its renderers)."""
+    tree = _children()
+    found, stack = [], list(tree.get(pid, []))
+    while stack:
+        child = stack.pop()
+        found.append(child)
+        stack.extend(tree.get(child, []))
+    return found
+
+
+def sample_memory() -> Dict[str, float]:
+    """RSS in MB of this Python process and of its child process tree."""
+    pid = os.getpid()
+    python_mb = _rss_bytes(pid) / 2**20
+    children_mb = sum(_rss_bytes(child) for child in descendants(pid)) / 2**20
+    return {"python_mb": round(python_mb, 1), "browser_mb": round(children_mb, 1),
+            "total_mb": round(python_mb + children_mb, 1)}
+
+
+class MemoryWatchdog:
+    """
+    Samples RSS of the Python process plus its whole child tree (the
+    Playwright driver, Chromium and every renderer) from /proc and raises a
+    pressure flag above `limit_mb`. Scrape loops poll recycle_action() at
+    safe points between projects, drain their pages and then recycle the
+    browser context, or the whole browser if a fresh context was not enough.
+    Callbacks registered with on_pressure() (e.g. flushing buffered records)
+    run each time the limit is crossed. Disabled without a limit or /proc.
+    """
+
+    def __init__(self, limit_mb: Optional[float] = None, interval_s: float = 15.0):
+        self.limit_mb = limit_mb
+        self.interval_s = interval_s
+        self.enabled = limit_mb is not None and os.path.exists("/proc/self/statm")
+        if limit_mb is not None and not self.enabled:
+            logger.warning("Memory watchdog needs /proc; running without it.")
+        self.pressure = False
+        self.last: Dict[str, float] = {}
+        self.peak_mb = 0.0
+        self.recycles = {"context": 0, "browser": 0}
+        self._last_action: Optional[str] = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def on_pressure(self, callback: Callable[[], None]):
+        self._callbacks.append(callback)
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Memory watchdog on: limit {self.limit_mb:.0f} MB, sampling every {self.interval_s:g}s.")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval_s)
+
+    async def check(self) -> bool:
+        """Take one sample and update the pressure flag."""
+        self.last = await asyncio.to_thread(sample_memory)
+        self.peak_mb = max(self.peak_mb, self.last["total_mb"])
+        over = self.last["total_mb"] > self.limit_mb
+        if over and not self.pressure:
+            logger.warning(f"Memory {self.last['total_mb']:.0f} MB over the {self.limit_mb:.0f} MB limit "
+                           f"(python {self.last['python_mb']:.0f} MB, browser {self.last['browser_mb']:.0f} MB); "
+                           f"recycling at the next safe point.")
+            for callback in self._callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.warning(f"Memory pressure callback failed: {e}")
+        if not over:
+            self._last_action = None
+        self.pressure = over
+        return over
+
+    def over_limit(self) -> bool:
+        return self.enabled and self.pressure
+
+    def recycle_action(self) -> Optional[str]:
+        """None, "context", or "browser" when a context recycle did not bring memory down."""
+        if not self.over_limit() or self._last_action == "browser":
+            # After a browser restart the remaining memory is not Chromium's to give back
+            return None
+        return "browser" if self._last_action == "context" else "context"
+
+    async def recycled(self, action: str):
+        """Report a finished recycle and re-sample so the flag reflects the new state."""
+        self.recycles[action] += 1
+        self._last_action = action
+        await self.check()
+        logger.info(f"Recycled {action}; memory now {self.last['total_mb']:.0f} MB.")
+        if self.pressure and action == "browser":
+            logger.warning("Still over the memory limit after a browser restart; not recycling again "
+                           "until memory drops below the limit.")
+
+    def stats(self) -> Dict[str, object]:
+        return {"memory_mb": self.last.get("total_mb"), "memory_peak_mb": round(self.peak_mb, 1),
+                "recycles": dict(self.recycles)}
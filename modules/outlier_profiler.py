@@ -0,0 +1,165 @@
+import asyncio
+import os
+import shutil
+import sys
+import threading
+import time
+import logging
+from collections import Counter, deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = "slow_profiles"
+
+
+class _StackSampler(threading.Thread):
+    """Samples the event-loop thread's Python stack into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True, name="outlier-sampler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        self.join(timeout=1)
+
+
+class _NoopWatch:
+    async def finish(self, failed: bool = False):
+        return None
+
+
+class _Watch:
+    def __init__(self, profiler: "OutlierProfiler", project_id, page, threshold: Optional[float]):
+        self.profiler = profiler
+        self.project_id = project_id
+        self.page = page
+        self.started = time.perf_counter()
+        self.sampler: Optional[_StackSampler] = None
+        self.tracing_context = None
+        self.armed = None
+        if threshold is not None:
+            self.armed = asyncio.create_task(self._arm(threshold))
+
+    async def _arm(self, threshold: float):
+        # Nothing is captured unless the project is still running past the threshold
+        await asyncio.sleep(threshold)
+        logger.info(f"Project {self.project_id} exceeded {threshold:.1f}s; starting deep capture.")
+        self.sampler = _StackSampler(threading.get_ident(), self.profiler.sample_interval)
+        self.sampler.start()
+        context = self.page.context
+        if context not in self.profiler._tracing:
+            try:
+                self.profiler._tracing.add(context)
+                self.tracing_context = context
+                await context.tracing.start(screenshots=True, snapshots=True)
+            except Exception as e:
+                self.profiler._tracing.discard(context)
+                self.tracing_context = None
+                logger.warning(f"Could not start Playwright tracing: {e}")
+
+    async def finish(self, failed: bool = False):
+        elapsed = time.perf_counter() - self.started
+        if self.armed:
+            self.armed.cancel()
+            await asyncio.gather(self.armed, return_exceptions=True)
+        self.profiler.latencies.append(elapsed)
+        if self.sampler is None:
+            return None
+        return await self.profiler._save(self, elapsed, failed)
+
+
+class OutlierProfiler:
+    """
+    Rolling latency distribution plus on-demand deep capture for slow projects.
+
+    Each project arms a timer at the current threshold (fixed seconds, or the
+    given percentile of recent latencies). Projects that finish before it fire
+    pay only for the timer. Once it fires, a Python stack sampler of the event
+    loop and a Playwright trace start; when the project ends, the trace, the
+    collapsed-stack profile and a page snapshot are written to one directory
+    under `slow_profiles/`. Only the newest `max_artefacts` are kept.
+    """
+
+    def __init__(self, directory: str = PROFILE_DIR, enabled: bool = False,
+                 threshold_s: Optional[float] = None, percentile: float = 0.99,
+                 window: int = 500, min_samples: int = 30,
+                 max_artefacts: int = 20, sample_interval: float = 0.005):
+        self.directory = directory
+        self.enabled = enabled
+        self.threshold_s = threshold_s
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_artefacts = max_artefacts
+        self.sample_interval = sample_interval
+        self.latencies: deque = deque(maxlen=window)
+        self._tracing: set = set()
+
+    def threshold(self) -> Optional[float]:
+        if self.threshold_s is not None:
+            return self.threshold_s
+        if len(self.latencies) < self.min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    def start(self, project_id, page):
+        if not self.enabled:
+            return _NoopWatch()
+        return _Watch(self, project_id, page, self.threshold())
+
+    async def _save(self, watch: _Watch, elapsed: float, failed: bool) -> str:
+        watch.sampler.stop()
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        out_dir = os.path.join(self.directory, f"{stamp}_{watch.project_id}_{elapsed:.0f}s")
+        os.makedirs(out_dir, exist_ok=True)
+
+        with open(os.path.join(out_dir, "event_loop.collapsed"), "w", encoding="utf-8") as f:
+            for stack, count in watch.sampler.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(out_dir, "pending_tasks.txt"), "w", encoding="utf-8") as f:
+            for task in asyncio.all_tasks():
+                f.write(f"{task!r}\n")
+                for frame in task.get_stack(limit=8):
+                    f.write(f"    {frame.f_code.co_filename}:{frame.f_lineno} {frame.f_code.co_name}\n")
+
+        if watch.tracing_context is not None:
+            try:
+                await watch.tracing_context.tracing.stop(path=os.path.join(out_dir, "playwright_trace.zip"))
+            except Exception as e:
+                logger.warning(f"Could not save Playwright trace: {e}")
+            finally:
+                self._tracing.discard(watch.tracing_context)
+
+        try:
+            with open(os.path.join(out_dir, "page.html"), "w", encoding="utf-8") as f:
+                f.write(await watch.page.content())
+            await watch.page.screenshot(path=os.path.join(out_dir, "page.png"), full_page=True)
+        except Exception as e:
+            logger.warning(f"Could not snapshot slow page: {e}")
+
+        logger.warning(f"Slow project {watch.project_id} ({elapsed:.1f}s{', failed' if failed else ''}) "
+                       f"profiled to {out_dir}")
+        self._prune()
+        return out_dir
+
+    def _prune(self):
+        entries = sorted(os.listdir(self.directory))
+        for name in entries[:max(0, len(entries) - self.max_artefacts)]:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
@@ -0,0 +1,73 @@
+import logging
+from typing import Any, Dict
+
+from modules.deadline import budget
+from modules.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Visible loaders the portal shows while its Angular sections fetch data
+BUSY_SELECTOR = ".spinner-border, .spinner, ngx-spinner, .loader, .loading"
+
+# Resolves once `selector` is rendered, no loader is visible and the DOM has
+# not changed for `quietMs`; or after `timeoutMs` with timed_out set.
+_STABLE_SCRIPT = """
+({selector, busySelector, quietMs, timeoutMs}) => new Promise(resolve => {
+    const started = performance.now();
+    let lastChange = started, mutations = 0, done = false;
+    const busy = () => busySelector &&
+        Array.from(document.querySelectorAll(busySelector)).some(el => el.offsetParent !== null);
+    const observer = new MutationObserver(records => {
+        mutations += records.length;
+        lastChange = performance.now();
+    });
+    observer.observe(document.documentElement,
+                     {subtree: true, childList: true, characterData: true, attributes: true});
+    const finish = timedOut => {
+        if (done) return;
+        done = true;
+        observer.disconnect();
+        clearInterval(timer);
+        resolve({
+            elapsed_ms: Math.round(performance.now() - started),
+            mutations,
+            sections: document.querySelectorAll(selector).length,
+            timed_out: timedOut,
+        });
+    };
+    const timer = setInterval(() => {
+        const now = performance.now();
+        if (document.querySelector(selector) && !busy() && now - lastChange >= quietMs) finish(false);
+        else if (now - started >= timeoutMs) finish(true);
+    }, 50);
+})
+"""
+
+
+class PageNotReady(Exception):
+    """The project sections never rendered."""
+
+
+async def wait_until_stable(page, selector: str, quiet_ms: int = 500, timeout_ms: int = 20000,
+                            busy_selector: str = BUSY_SELECTOR) -> Dict[str, Any]:
+    """
+    Wait until the project view has rendered `selector` and stopped changing,
+    observed in the page with a MutationObserver rather than network idleness.
+    Returns {"elapsed_ms", "mutations", "sections", "timed_out"}. A page that is
+    rendered but never fully quiet is accepted at the timeout; one without any
+    `selector` raises PageNotReady.
+    """
+    with tracer.span("readiness.observe") as span:
+        result = await page.evaluate(_STABLE_SCRIPT, {
+            "selector": selector, "busySelector": busy_selector,
+            "quietMs": quiet_ms, "timeoutMs": budget(timeout_ms),
+        })
+        if hasattr(span, "args"):
+            span.args.update(result)
+
+    if not result["sections"]:
+        raise PageNotReady(f"no '{selector}' after {result['elapsed_ms']} ms")
+    if result["timed_out"]:
+        logger.info(f"Page still changing after {result['elapsed_ms']} ms "
+                    f"({result['mutations']} mutations); continuing with {result['sections']} sections.")
+    return result
@@ -0,0 +1,198 @@
+import json
+import math
+import os
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REFRESH_STATE_FILENAME = "refresh_state.jsonl"
+
+# The log is rewritten once it holds this many lines per project (and at
+# least COMPACT_MIN_LINES), on load and at shutdown
+COMPACT_RATIO = 2
+COMPACT_MIN_LINES = 1000
+
+# Columns whose change counts as "the project changed" between two scrapes
+WATCHED_FIELDS = ("project_status", "extension_date", "proposed_completion_date",
+                  "summary_total_no_of_sold_units", "summary_total_no_of_booked",
+                  "complaint_count", "complaint_numbers")
+
+# Target days between refreshes by project_status (lower-cased substring match)
+STATUS_INTERVAL_DAYS = {
+    "ongoing": 7.0,
+    "new": 7.0,
+    "completed": 120.0,
+    "lapsed": 60.0,
+    "deregistered": 365.0,
+    "revoked": 365.0,
+}
+DEFAULT_INTERVAL_DAYS = 30.0
+
+# Ongoing projects this close to (or past) their completion date change most
+COMPLETION_WINDOW_DAYS = 90.0
+
+_DATE_FORMATS = ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%d %b %Y", "%d-%b-%Y")
+
+
+def parse_date(value: Any) -> Optional[float]:
+    """Portal date string -> epoch seconds, or None."""
+    if not value:
+        return None
+    text = str(value).strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+class RefreshScheduler:
+    """
+    Picks which known projects to re-scrape next, within a projects-per-hour budget.
+
+    Every saved record is observed: last scrape time, status, completion date
+    and whether any WATCHED_FIELDS value differs from the previous scrape.
+    A project's target interval comes from its status, shortened by its own
+    observed change rate and by a completion date that is near or overdue.
+    Priority is time since last scrape divided by that interval, so a project
+    becomes due at 1.0; never-scraped IDs come first. State is an append-only
+    JSONL log (latest line per project wins), like the search index.
+    """
+
+    def __init__(self, path: str = REFRESH_STATE_FILENAME):
+        self.path = path
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.log_lines = 0
+
+    @classmethod
+    def load(cls, path: str = REFRESH_STATE_FILENAME) -> "RefreshScheduler":
+        scheduler = cls(path)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        scheduler.state[str(entry["project_id"])] = entry
+                        scheduler.log_lines += 1
+            logger.info(f"Loaded refresh state for {len(scheduler.state)} projects from {path}")
+            scheduler.maybe_compact()
+        return scheduler
+
+    def observe(self, record: Dict[str, Any], now: Optional[float] = None):
+        """Record one successful scrape of a project."""
+        project_id = record.get("project_id")
+        if project_id is None:
+            return
+        now = time.time() if now is None else now
+        key = str(project_id)
+        previous = self.state.get(key)
+        watched = dict(previous["watched"]) if previous else {}
+
+        changed = False
+        for field in WATCHED_FIELDS:
+            # Fields a partial (--fields) scrape did not produce are left as they were
+            if field not in record:
+                continue
+            value = record[field]
+            value = None if value is None else str(value).strip()
+            if previous and field in watched and watched[field] != value:
+                changed = True
+            watched[field] = value
+
+        entry = {
+            "project_id": project_id,
+            "last_scraped": now,
+            "status": record.get("project_status", previous.get("status") if previous else None),
+            "completion": record.get("extension_date") or record.get("proposed_completion_date")
+                          or (previous.get("completion") if previous else None),
+            "observations": (previous["observations"] if previous else 0) + 1,
+            "changes": (previous["changes"] if previous else 0) + int(changed),
+            "watched": watched,
+        }
+        self.state[key] = entry
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+        self.log_lines += 1
+
+    def interval_days(self, entry: Dict[str, Any], now: float) -> float:
+        status = (entry.get("status") or "").lower()
+        interval = next((days for name, days in STATUS_INTERVAL_DAYS.items() if name in status),
+                        DEFAULT_INTERVAL_DAYS)
+
+        # Smoothed share of re-scrapes that found a change (prior 1 in 4)
+        rescrapes = max(0, entry.get("observations", 1) - 1)
+        change_rate = (entry.get("changes", 0) + 0.25) / (rescrapes + 1)
+        interval *= 2.0 / (1.0 + 4.0 * min(1.0, change_rate))
+
+        completion = parse_date(entry.get("completion"))
+        if completion is not None and "complete" not in status:
+            if completion - now < COMPLETION_WINDOW_DAYS * 86400:
+                interval /= 2.0
+        return max(1.0, interval)
+
+    def priority(self, project_id: Any, now: Optional[float] = None) -> float:
+        entry = self.state.get(str(project_id))
+        if entry is None:
+            return math.inf
+        now = time.time() if now is None else now
+        age_days = (now - entry["last_scraped"]) / 86400
+        return age_days / self.interval_days(entry, now)
+
+    def next_batch(self, candidates: Optional[Iterable[Any]] = None, per_hour: int = 200,
+                   hours: float = 1.0, min_priority: float = 1.0,
+                   now: Optional[float] = None) -> List[int]:
+        """
+        The most overdue project IDs that fit in `per_hour * hours` scrapes.
+        `candidates` defaults to every project seen so far; IDs with no state
+        (e.g. fresh from discovery) are scheduled first.
+        """
+        now = time.time() if now is None else now
+        pool = self.state.keys() if candidates is None else candidates
+        scored: List[Tuple[float, int]] = []
+        for project_id in pool:
+            score = self.priority(project_id, now)
+            if score >= min_priority:
+                scored.append((score, int(project_id)))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        limit = max(0, int(per_hour * hours))
+        batch = [project_id for _, project_id in scored[:limit]]
+        logger.info(f"Refresh: {len(scored)} projects due, scheduling {len(batch)} "
+                    f"(budget {per_hour}/h for {hours:g}h).")
+        return batch
+
+    def compact(self):
+        """Rewrite the log with only the latest line per project."""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self.state.values():
+                f.write(json.dumps(entry, default=str) + "\n")
+        os.replace(tmp, self.path)
+        self.log_lines = len(self.state)
+
+    def maybe_compact(self):
+        """compact() once superseded lines dominate the log."""
+        if self.log_lines > max(COMPACT_MIN_LINES, COMPACT_RATIO * len(self.state)):
+            before = self.log_lines
+            self.compact()
+            logger.info(f"Compacted refresh state {self.path}: {before} -> {self.log_lines} lines")
+
+
+_schedulers: Dict[str, RefreshScheduler] = {}
+
+
+def get_refresh_scheduler(path: str = REFRESH_STATE_FILENAME) -> RefreshScheduler:
+    """Process-wide scheduler per path, loaded on first use."""
+    if path not in _schedulers:
+        _schedulers[path] = RefreshScheduler.load(path)
+    return _schedulers[path]
+
+
+def compact_refresh_schedulers():
+    """Compact every scheduler loaded in this process whose log has grown; call at shutdown."""
+    for scheduler in _schedulers.values():
+        scheduler.maybe_compact()
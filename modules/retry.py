@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import random
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from modules.deadline import DeadlineExceeded, remaining
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("navigation", "captcha", "readiness", "extraction", "save")
+
+DEAD_LETTER_DIR = "dead_letters"
+
+
+class StageError(Exception):
+    """A scrape failed in a specific stage after that stage's retries were used up."""
+
+    def __init__(self, stage: str, message: str, attempts: int = 1, cause: Optional[BaseException] = None):
+        super().__init__(f"[{stage}] {message}")
+        self.stage = stage
+        self.message = message
+        self.attempts = attempts
+        self.cause = cause
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 15.0
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) failed attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+DEFAULT_POLICIES: Dict[str, RetryPolicy] = {
+    "navigation": RetryPolicy(attempts=3, base_delay=2.0, max_delay=20.0),
+    "captcha": RetryPolicy(attempts=4, base_delay=0.5, max_delay=3.0),
+    "readiness": RetryPolicy(attempts=2, base_delay=1.0, max_delay=5.0),
+    "extraction": RetryPolicy(attempts=2, base_delay=1.0, max_delay=5.0),
+    "save": RetryPolicy(attempts=5, base_delay=0.5, max_delay=10.0),
+}
+
+
+async def run_stage(stage: str, fn: Callable[[], Awaitable[Any]],
+                    policies: Optional[Dict[str, RetryPolicy]] = None, label: str = "") -> Any:
+    """
+    Run one stage with that stage's retry policy. Any exception raised by `fn`
+    counts as a failure of this stage; the last one is wrapped in a StageError.
+    """
+    policy = (policies or DEFAULT_POLICIES).get(stage, RetryPolicy(attempts=1))
+    last_error: Optional[BaseException] = None
+
+    for attempt in range(policy.attempts):
+        try:
+            return await fn()
+        except StageError as e:
+            if e.stage != stage:
+                raise
+            last_error = e.cause or e
+        except (asyncio.CancelledError, DeadlineExceeded):
+            raise
+        except Exception as e:
+            last_error = e
+
+        if attempt + 1 < policy.attempts:
+            delay = policy.delay(attempt)
+            left = remaining()
+            if left is not None and left <= delay:
+                # No point backing off past the project's deadline
+                raise DeadlineExceeded(f"{stage} failed with no time left to retry: {last_error}")
+            logger.warning(f"{stage} failed for {label} (attempt {attempt + 1}/{policy.attempts}): "
+                           f"{last_error}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    raise StageError(stage, str(last_error), attempts=policy.attempts, cause=last_error)
+
+
+class DeadLetterQueue:
+    """
+    Projects that exhausted their retries, one JSON line each in
+    dead_letters/dead_letters.jsonl, with an HTML snapshot of the page (or the
+    record, for save failures) next to it for triage.
+    """
+
+    def __init__(self, directory: str = DEAD_LETTER_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, "dead_letters.jsonl")
+
+    async def add(self, project_id: Any, error: StageError, page=None, record: Optional[dict] = None):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        snapshot = None
+
+        try:
+            if page is not None:
+                snapshot = os.path.join(self.directory, f"{project_id}_{stamp}.html")
+                with open(snapshot, "w", encoding="utf-8") as f:
+                    f.write(await page.content())
+            elif record is not None:
+                snapshot = os.path.join(self.directory, f"{project_id}_{stamp}.json")
+                with open(snapshot, "w", encoding="utf-8") as f:
+                    json.dump(record, f, default=str)
+        except Exception as e:
+            logger.warning(f"Could not snapshot dead-lettered project {project_id}: {e}")
+            snapshot = None
+
+        entry = {
+            "project_id": project_id,
+            "stage": error.stage,
+            "attempts": error.attempts,
+            "error": error.message,
+            "error_type": type(error.cause).__name__ if error.cause else "StageError",
+            "snapshot": snapshot,
+            "failed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        logger.error(f"Project {project_id} dead-lettered at stage '{error.stage}': {error.message}")
@@ -0,0 +1,208 @@
+import bisect
+import json
+import os
+import re
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "search_index.jsonl"
+
+# The log is rewritten once it holds this many lines per live document
+# (and at least COMPACT_MIN_LINES), on load and at shutdown
+COMPACT_RATIO = 2
+COMPACT_MIN_LINES = 1000
+
+# Field -> weight. Matches in the project name count more than in the address.
+INDEXED_FIELDS = {
+    "project_name": 3.0,
+    "registration_number": 3.0,
+    "promoter_details": 2.0,
+    "planning_authority": 1.0,
+    "project_address_village": 1.5,
+    "project_address_taluka": 1.0,
+    "project_address_district": 1.0,
+    "project_address_state_ut": 0.5,
+    "project_address_pin_code": 1.0,
+}
+
+# Columns kept per document so results can be shown without the full record
+STORED_FIELDS = ("project_id", "registration_number", "project_name", "project_status",
+                 "project_address_district", "project_address_village", "promoter_details")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(str(text).lower()) if text else []
+
+
+def _trigrams(token: str) -> set:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ProjectSearchIndex:
+    """
+    In-memory inverted index over scraped projects with exact, prefix and
+    trigram-fuzzy term matching. Persisted as an append-only JSONL log of
+    stored documents, so every new record is a single appended line and
+    the latest line per project wins on load.
+    """
+
+    def __init__(self, path: str = INDEX_FILENAME):
+        self.path = path
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.doc_terms: Dict[str, set] = {}
+        self.trigrams: Dict[str, set] = defaultdict(set)
+        self._vocab: List[str] = []
+        self._vocab_dirty = False
+        self.log_lines = 0
+
+    @classmethod
+    def load(cls, path: str = INDEX_FILENAME) -> "ProjectSearchIndex":
+        index = cls(path)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        index._index_doc(json.loads(line))
+                        index.log_lines += 1
+            logger.info(f"Loaded search index with {len(index.docs)} projects from {path}")
+            index.maybe_compact()
+        return index
+
+    @staticmethod
+    def _doc_id(record: Dict[str, Any]) -> Optional[str]:
+        key = record.get("project_id") or record.get("registration_number")
+        return str(key) if key else None
+
+    def add(self, record: Dict[str, Any], persist: bool = True):
+        """Index (or re-index) one scraped record; fields a partial record lacks keep their indexed values."""
+        previous = self.docs.get(self._doc_id(record)) or {}
+        doc = {k: record[k] if k in record else previous.get(k)
+               for k in set(INDEXED_FIELDS) | set(STORED_FIELDS)}
+        if self._doc_id(doc) is None:
+            return
+        self._index_doc(doc)
+        if persist:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(doc, default=str) + "\n")
+            self.log_lines += 1
+
+    def _index_doc(self, doc: Dict[str, Any]):
+        doc_id = self._doc_id(doc)
+        if doc_id is None:
+            return
+        self._remove(doc_id)
+
+        weights: Dict[str, float] = defaultdict(float)
+        for field, weight in INDEXED_FIELDS.items():
+            for token in tokenize(doc.get(field)):
+                weights[token] += weight
+
+        for token, weight in weights.items():
+            if token not in self.postings or not self.postings[token]:
+                self._vocab_dirty = True
+                for gram in _trigrams(token):
+                    self.trigrams[gram].add(token)
+            self.postings[token][doc_id] = weight
+
+        self.doc_terms[doc_id] = set(weights)
+        self.docs[doc_id] = doc
+
+    def _remove(self, doc_id: str):
+        for token in self.doc_terms.pop(doc_id, ()):
+            self.postings[token].pop(doc_id, None)
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(t for t, p in self.postings.items() if p)
+            self._vocab_dirty = False
+        start = bisect.bisect_left(self._vocab, prefix)
+        end = bisect.bisect_left(self._vocab, prefix + "\uffff")
+        return self._vocab[start:end]
+
+    def _fuzzy_terms(self, token: str, min_similarity: float) -> Dict[str, float]:
+        grams = _trigrams(token)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self.trigrams.get(gram, ()):
+                shared[candidate] += 1
+        matches = {}
+        for candidate, overlap in shared.items():
+            similarity = overlap / (len(grams) + len(_trigrams(candidate)) - overlap)
+            if similarity >= min_similarity and self.postings.get(candidate):
+                matches[candidate] = similarity
+        return matches
+
+    def _expand(self, token: str, fuzzy: bool, min_similarity: float) -> Dict[str, float]:
+        """Query token -> {indexed term: match quality}."""
+        terms: Dict[str, float] = {}
+        if self.postings.get(token):
+            terms[token] = 1.0
+        for term in self._prefix_terms(token):
+            terms.setdefault(term, 0.8)
+        if fuzzy and not terms:
+            terms.update(self._fuzzy_terms(token, min_similarity))
+        return terms
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True,
+               min_similarity: float = 0.3) -> List[Dict[str, Any]]:
+        """Rank projects by how many query terms they match, then by weighted score."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        matched: Dict[str, int] = defaultdict(int)
+        scores: Dict[str, float] = defaultdict(float)
+        for token in tokens:
+            hit_docs = set()
+            for term, quality in self._expand(token, fuzzy, min_similarity).items():
+                for doc_id, weight in self.postings[term].items():
+                    scores[doc_id] += quality * weight
+                    hit_docs.add(doc_id)
+            for doc_id in hit_docs:
+                matched[doc_id] += 1
+
+        # Require a majority of the query terms to match
+        needed = (len(tokens) + 1) // 2
+        ranked = sorted((d for d in matched if matched[d] >= needed),
+                        key=lambda d: (matched[d], scores[d]), reverse=True)
+        return [dict(self.docs[d], score=round(scores[d], 3)) for d in ranked[:limit]]
+
+    def compact(self):
+        """Rewrite the log with only the latest document per project."""
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for doc in self.docs.values():
+                f.write(json.dumps(doc, default=str) + "\n")
+        os.replace(tmp, self.path)
+        self.log_lines = len(self.docs)
+
+    def maybe_compact(self):
+        """compact() once superseded lines dominate the log."""
+        if self.log_lines > max(COMPACT_MIN_LINES, COMPACT_RATIO * len(self.docs)):
+            before = self.log_lines
+            self.compact()
+            logger.info(f"Compacted search index {self.path}: {before} -> {self.log_lines} lines")
+
+
+_indexes: Dict[str, ProjectSearchIndex] = {}
+
+
+def get_search_index(path: str = INDEX_FILENAME) -> ProjectSearchIndex:
+    """Process-wide index per path, loaded on first use."""
+    if path not in _indexes:
+        _indexes[path] = ProjectSearchIndex.load(path)
+    return _indexes[path]
+
+
+def compact_search_indexes():
+    """Compact every index loaded in this process whose log has grown; call at shutdown."""
+    for index in _indexes.values():
+        index.maybe_compact()
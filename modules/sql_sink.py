@@ -0,0 +1,211 @@
+import json
+import sqlite3
+import logging
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# child table -> (columns, structured key emitted by DataExtracter)
+CHILD_TABLES = {
+    "partners": (("name", "designation"), "_partners"),
+    "professionals": (("professional_type", "name"), "_professionals"),
+    "landowners": (("name", "owner_type", "share_type"), "_landowners"),
+    "buildings": (("building_identification_plan", "wing_identification_plan", "sanctioned_floors",
+                   "sanctioned_habitable_floors", "sanctioned_apartments", "cc_issued_floors",
+                   "view_document_available"), "_buildings"),
+    "unit_summaries": (("summary_identification_building_wing", "summary_identification_wing_plan",
+                        "summary_floor_type", "summary_total_no_of_residential_apartments",
+                        "summary_total_no_of_non_residential_apartments",
+                        "summary_total_no_of_apartments_nr_r", "summary_total_no_of_sold_units",
+                        "summary_total_no_of_unsold_units", "summary_total_no_of_booked",
+                        "summary_total_no_of_rehab_units", "summary_total_no_of_mortgage",
+                        "summary_total_no_of_reservation",
+                        "summary_total_no_of_land_owner_investor_share_sale",
+                        "summary_total_no_of_land_owner_investor_share_not_for_sale"), "_unit_summaries"),
+    "complaints": (("complaint_number",), "_complaints"),
+    "agents": (("name", "certificate_no"), "_agents"),
+    "parking": (("open_space_total", "closed_space_total"), "_parking"),
+}
+
+# Flattened comma-joined columns that live in child tables instead of `projects`
+CHILD_SOURCE_COLUMNS = {
+    "partner_name", "partner_designation", "architect_names", "engineer_names",
+    "chartered_accountant_names", "other_professional_names", "landowner_names",
+    "landowner_types", "landowner_share_types", "complaint_numbers",
+    "real_estate_agent_names", "maharera_certificate_nos",
+    "open_space_parking_total", "closed_space_parking_total",
+} | set(CHILD_TABLES["buildings"][0]) | set(CHILD_TABLES["unit_summaries"][0])
+
+# Fallback for records without structured rows (e.g. reloaded from CSV):
+# child table -> {child column: flattened source column}
+_SPLIT_FALLBACK = {
+    "partners": {"name": "partner_name", "designation": "partner_designation"},
+    "landowners": {"name": "landowner_names", "owner_type": "landowner_types", "share_type": "landowner_share_types"},
+    "buildings": {c: c for c in CHILD_TABLES["buildings"][0]},
+    "unit_summaries": {c: c for c in CHILD_TABLES["unit_summaries"][0]},
+    "complaints": {"complaint_number": "complaint_numbers"},
+    "agents": {"name": "real_estate_agent_names", "certificate_no": "maharera_certificate_nos"},
+    "parking": {"open_space_total": "open_space_parking_total", "closed_space_total": "closed_space_parking_total"},
+}
+_PROFESSIONAL_COLUMNS = {
+    "architect": "architect_names", "engineer": "engineer_names",
+    "chartered accountant": "chartered_accountant_names", "other": "other_professional_names",
+}
+
+INDEXED_COLUMNS = ("registration_number", "project_address_district", "project_status")
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _split(value: Any) -> List[str]:
+    if value is None or value == "":
+        return []
+    return [part.strip() for part in str(value).split(",")]
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, bool):
+        return str(value)
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return json.dumps(value, default=str)
+
+
+class SqlSink:
+    """
+    Normalised relational output: one `projects` row per project plus child
+    tables for the one-to-many blocks. Records are buffered and written in
+    batched upserts; a project's child rows are replaced whenever the record
+    carries that block.
+    Uses SQLite, or DuckDB when the path ends in `.duckdb`.
+    """
+
+    def __init__(self, path: str, columns: Iterable[str], batch_size: int = 100):
+        self.path = path
+        self.batch_size = batch_size
+        self.project_columns = [c for c in columns if c not in CHILD_SOURCE_COLUMNS and c != "project_id"]
+        self._buffer: List[Dict[str, Any]] = []
+
+        if path.endswith(".duckdb"):
+            import duckdb
+            self.conn = duckdb.connect(path)
+        else:
+            self.conn = sqlite3.connect(path, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        self.conn.execute("CREATE TABLE IF NOT EXISTS schema_info (version INTEGER NOT NULL)")
+        row = self.conn.execute("SELECT version FROM schema_info").fetchone()
+        if row and row[0] > SCHEMA_VERSION:
+            raise RuntimeError(f"{self.path} has schema version {row[0]}, this code supports {SCHEMA_VERSION}")
+
+        cols = ", ".join(f"{_q(c)} TEXT" for c in self.project_columns)
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS projects (project_id BIGINT PRIMARY KEY, {cols})")
+        for table, (columns, _) in CHILD_TABLES.items():
+            child_cols = ", ".join(f"{_q(c)} TEXT" for c in columns)
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (project_id BIGINT NOT NULL, position INTEGER NOT NULL, "
+                f"{child_cols}, PRIMARY KEY (project_id, position))"
+            )
+        for column in INDEXED_COLUMNS:
+            if column in self.project_columns:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_projects_{column} ON projects ({_q(column)})")
+
+        if not row:
+            self.conn.execute("INSERT INTO schema_info (version) VALUES (?)", [SCHEMA_VERSION])
+
+    def child_rows(self, record: Dict[str, Any]) -> Dict[str, List[tuple]]:
+        """Child rows per table, only for tables the record carries data for."""
+        rows: Dict[str, List[tuple]] = {}
+        for table, (columns, key) in CHILD_TABLES.items():
+            items = record.get(key)
+            if items is not None:
+                if table == "complaints":
+                    items = [{"complaint_number": c} for c in items]
+                rows[table] = [tuple(_scalar(item.get(c)) for c in columns) for item in items]
+            elif table == "professionals":
+                if any(source in record for source in _PROFESSIONAL_COLUMNS.values()):
+                    rows[table] = [(kind, name) for kind, source in _PROFESSIONAL_COLUMNS.items()
+                                   for name in _split(record.get(source)) if name]
+            elif any(source in record for source in _SPLIT_FALLBACK[table].values()):
+                split = {c: _split(record.get(source)) for c, source in _SPLIT_FALLBACK[table].items()}
+                length = max((len(v) for v in split.values()), default=0)
+                rows[table] = [tuple(split[c][i] if i < len(split[c]) else None for c in columns)
+                               for i in range(length)]
+        return rows
+
+    def add(self, record: Dict[str, Any]):
+        if record.get("project_id") is None:
+            logger.warning("Skipping record without project_id for SQL sink.")
+            return
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Upsert buffered records. Only the columns and child tables present in a
+        record are touched, so partial records (e.g. --fields runs) update in place.
+        """
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        by_id: Dict[int, Dict[str, Any]] = {}
+        for record in batch:
+            pid = int(record["project_id"])
+            by_id[pid] = {**by_id.get(pid, {}), **record}
+
+        # executemany needs one statement per distinct column set
+        groups: Dict[tuple, List[list]] = {}
+        for pid, record in by_id.items():
+            present = tuple(c for c in self.project_columns if c in record)
+            groups.setdefault(present, []).append([pid] + [_scalar(record[c]) for c in present])
+
+        children = {pid: self.child_rows(r) for pid, r in by_id.items()}
+
+        self.conn.execute("BEGIN")
+        try:
+            for present, rows in groups.items():
+                cols = ", ".join(["project_id"] + [_q(c) for c in present])
+                marks = ", ".join(["?"] * (len(present) + 1))
+                update = ", ".join(f"{_q(c)} = excluded.{_q(c)}" for c in present)
+                conflict = f"DO UPDATE SET {update}" if present else "DO NOTHING"
+                self.conn.executemany(
+                    f"INSERT INTO projects ({cols}) VALUES ({marks}) ON CONFLICT (project_id) {conflict}", rows)
+
+            for table, (columns, _) in CHILD_TABLES.items():
+                ids = [pid for pid in by_id if table in children[pid]]
+                if not ids:
+                    continue
+                id_marks = ", ".join(["?"] * len(ids))
+                self.conn.execute(f"DELETE FROM {table} WHERE project_id IN ({id_marks})", ids)
+                child_rows = [(pid, pos) + row for pid in ids
+                              for pos, row in enumerate(children[pid][table])]
+                if child_rows:
+                    marks = ", ".join(["?"] * (len(columns) + 2))
+                    cols = ", ".join(["project_id", "position"] + [_q(c) for c in columns])
+                    self.conn.executemany(f"INSERT INTO {table} ({cols}) VALUES ({marks})", child_rows)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            self._buffer = batch + self._buffer
+            raise
+        logger.info(f"SQL sink wrote {len(by_id)} project(s) to {self.path}")
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
@@ -0,0 +1,148 @@
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+import logging
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (owning task, lane id) for the span stack of the current context
+_lane: ContextVar[Optional[Tuple[int, int]]] = ContextVar("trace_lane", default=None)
+_parent: ContextVar[Optional[str]] = ContextVar("trace_parent", default=None)
+
+
+def _task_key() -> int:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else -threading.get_ident()
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start", "tid", "tokens")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        # Each asyncio task (e.g. every block under asyncio.gather) gets its own
+        # lane so concurrent siblings never overlap on one track; spans opened
+        # within the same task share the lane and nest by time.
+        key = _task_key()
+        lane = _lane.get()
+        if lane is None or lane[0] != key:
+            self.tid = self.tracer._new_lane(self.name, _parent.get())
+            lane_token = _lane.set((key, self.tid))
+        else:
+            self.tid = lane[1]
+            lane_token = None
+        parent_name = _parent.get()
+        self.tokens = (lane_token, _parent.set(f"{parent_name} > {self.name}" if parent_name else self.name))
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        lane_token, parent_token = self.tokens
+        _parent.reset(parent_token)
+        if lane_token is not None:
+            _lane.reset(lane_token)
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer._record(self.name, self.start, end, self.tid, self.args)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+class Tracer:
+    """
+    Span recorder exporting Chrome trace-event JSON (chrome://tracing, Perfetto).
+    Disabled by default; spans are then a shared no-op object.
+
+        with tracer.span("captcha.ocr", project=pid): ...
+        async with tracer.span("navigation"): ...
+    """
+
+    def __init__(self, max_events: int = 500_000):
+        self.enabled = False
+        # Long runs would otherwise grow the event list without bound
+        self.max_events = max_events
+        self.dropped = 0
+        self.events: List[Dict[str, Any]] = []
+        self._pid = os.getpid()
+        self._t0 = time.perf_counter()
+        self._lanes = itertools.count(1)
+
+    def enable(self):
+        self.enabled = True
+        self.dropped = 0
+        self.events.clear()
+        self._t0 = time.perf_counter()
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name, args)
+
+    def _us(self, t: float) -> float:
+        return round((t - self._t0) * 1e6, 1)
+
+    def _new_lane(self, name: str, parent: Optional[str]) -> int:
+        tid = next(self._lanes)
+        if len(self.events) >= self.max_events:
+            # Lane labels count against the cap too; the lane's spans are dropped anyway
+            self.dropped += 1
+            return tid
+        label = f"{parent} > {name}" if parent else name
+        self.events.append({"ph": "M", "name": "thread_name", "pid": self._pid, "tid": tid,
+                            "args": {"name": label}})
+        return tid
+
+    def _record(self, name: str, start: float, end: float, tid: int, args: Dict[str, Any]):
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        self.events.append({
+            "ph": "X", "name": name, "cat": name.split(".")[0],
+            "ts": self._us(start), "dur": round((end - start) * 1e6, 1),
+            "pid": self._pid, "tid": tid,
+            "args": {k: str(v) for k, v in args.items()},
+        })
+
+    def export(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        logger.info(f"Wrote {sum(1 for e in self.events if e['ph'] == 'X')} spans to {path}"
+                    + (f" ({self.dropped} dropped past max_events)" if self.dropped else ""))
+
+
+tracer = Tracer()
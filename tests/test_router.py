@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agents.router import SupervisorRouter, fast_route
+
+
+class FakeTool:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def invoke(self, tool_input):
+        self.calls.append(tool_input)
+        return f"{self.name}:{tool_input}"
+
+    async def ainvoke(self, tool_input):
+        return self.invoke(tool_input)
+
+
+class FakeExecutor:
+    """Stands in for the LLM AgentExecutor: answers with one scripted tool call."""
+
+    def __init__(self, tool, tool_input, output="final answer"):
+        self.step = (SimpleNamespace(tool=tool, tool_input=tool_input), "raw tool output")
+        self.output = output
+        self.calls = 0
+
+    def invoke(self, inputs, **kwargs):
+        self.calls += 1
+        return {"input": inputs["input"], "output": self.output, "intermediate_steps": [self.step]}
+
+    async def ainvoke(self, inputs, **kwargs):
+        return self.invoke(inputs, **kwargs)
+
+
+def make_router(executor):
+    tools = [FakeTool(n) for n in ("maharera_search", "maharera_scrape", "maharera_scrape_batch")]
+    return SupervisorRouter(executor, tools), {t.name: t for t in tools}
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("P51800005350", ("maharera_scrape", "P51800005350")),
+    ("  scrape p51800005350 please ", ("maharera_scrape", "P51800005350")),
+    ("Registration no: P51800005350?", ("maharera_scrape", "P51800005350")),
+    ("P51800005350, P52100012345", ("maharera_scrape_batch", {"projects": ["P51800005350", "P52100012345"]})),
+    ("project id 12345", ("maharera_scrape", "12345")),
+    ("id:987", ("maharera_scrape", "987")),
+])
+def test_fast_route_plain_identifiers(query, expected):
+    assert fast_route(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "Tell me about P51800005350 and who built Lodha Park",
+    "411001",
+    "2024",
+    "projects in pune",
+    "id 1234567890",
+    "",
+])
+def test_fast_route_leaves_other_queries_to_the_llm(query):
+    assert fast_route(query) is None
+
+
+def test_fast_path_skips_the_llm():
+    executor = FakeExecutor("maharera_search", "unused")
+    router, tools = make_router(executor)
+
+    result = router.invoke({"input": "P51800005350"})
+
+    assert result["route"] == "maharera_scrape"
+    assert tools["maharera_scrape"].calls == ["P51800005350"]
+    assert executor.calls == 0
+    assert router.stats["fast_path"] == 1
+
+
+def test_llm_fallback_returns_the_model_answer_and_does_not_cache_other_tools():
+    executor = FakeExecutor("maharera_search", "lodha park", output="Lodha Park is by Lodha")
+    router, tools = make_router(executor)
+
+    for _ in range(2):
+        result = router.invoke({"input": "who built Lodha Park"})
+        assert result["output"] == "Lodha Park is by Lodha"
+
+    assert executor.calls == 2
+    assert router.stats == {"fast_path": 0, "cache_hit": 0, "llm": 2}
+    assert tools["maharera_search"].calls == []
+
+
+def test_llm_scrape_decision_is_cached():
+    executor = FakeExecutor("maharera_scrape", "P51800005350")
+    router, tools = make_router(executor)
+
+    router.invoke({"input": "the Lodha Park registration P51800005350 project page"})
+    result = asyncio.run(router.ainvoke({"input": "The Lodha Park registration  P51800005350 project page"}))
+
+    assert executor.calls == 1
+    assert result["route"] == "maharera_scrape"
+    assert tools["maharera_scrape"].calls == ["P51800005350"]
+    assert router.stats["cache_hit"] == 1